@@ -5,7 +5,6 @@ Core package for Hekate SD Card Migrator
 from core.disk_manager import DiskManager
 from core.partition_scanner import PartitionScanner
 from core.partition_writer import PartitionWriter
-from core.migration_engine import MigrationEngine
 from core.partition_models import DiskLayout, Partition, PartitionType
 
 __all__ = [
@@ -17,3 +16,11 @@ __all__ = [
     'Partition',
     'PartitionType'
 ]
+
+
+def __getattr__(name):
+    # MigrationEngine is only needed once an operation starts; load it on first access
+    if name == 'MigrationEngine':
+        from core.migration_engine import MigrationEngine
+        return MigrationEngine
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,9 +6,11 @@ import sys
 import os
 import subprocess
 import logging
+import threading
 import time
 
 if sys.platform == 'win32':
+    import pythoncom
     import wmi
     import win32file
     import win32api
@@ -24,8 +26,13 @@ class DiskManager:
         if sys.platform != 'win32':
             raise RuntimeError("This tool only supports Windows")
 
+        # WMI connections are COM objects bound to the thread that created them,
+        # so every thread gets its own connection (see the wmi property)
+        self._local = threading.local()
+        self._main_thread = threading.current_thread()
+
         try:
-            self.wmi = wmi.WMI()
+            self._local.wmi = wmi.WMI()
         except Exception as e:
             error_msg = str(e)
             # Provide more helpful error message
@@ -41,6 +48,23 @@ class DiskManager:
             else:
                 raise RuntimeError(f"Failed to initialize disk manager: {error_msg}")
 
+    @property
+    def wmi(self):
+        """WMI connection for the calling thread"""
+        connection = getattr(self._local, 'wmi', None)
+        if connection is None:
+            if threading.current_thread() is not self._main_thread:
+                # Worker threads must initialize COM before talking to WMI
+                pythoncom.CoInitialize()
+            connection = wmi.WMI()
+            self._local.wmi = connection
+        return connection
+
+    @wmi.setter
+    def wmi(self, connection):
+        """Replace the calling thread's WMI connection (used to refresh a stale one)"""
+        self._local.wmi = connection
+
     def list_disks(self):
         """
         List all physical disks
@@ -96,10 +120,10 @@ class DiskManager:
                         if physical_disk.MediaType and 'Removable' in physical_disk.MediaType:
                             drive_info = {
                                 'letter': logical_disk.DeviceID,  # e.g., "H:"
-                                'name': logical_disk.VolumeName or logical_disk.DeviceID,
-                                'physical_drive': f"\\\\.\\PhysicalDrive{physical_disk.Index}",
-                                'physical_index': physical_disk.Index,
-                                'disk_name': physical_disk.Caption or physical_disk.Model or f"Disk {physical_disk.Index}",
+                                'volume_name': logical_disk.VolumeName or logical_disk.DeviceID,
+                                'path': f"\\\\.\\PhysicalDrive{physical_disk.Index}",
+                                'index': physical_disk.Index,
+                                'name': physical_disk.Caption or physical_disk.Model or f"Disk {physical_disk.Index}",
                                 'size_bytes': int(physical_disk.Size) if physical_disk.Size else 0,
                                 'size_gb': int(physical_disk.Size) / (1024**3) if physical_disk.Size else 0,
                                 'partition_size_bytes': int(logical_disk.Size) if logical_disk.Size else 0,
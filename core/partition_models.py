@@ -116,6 +116,23 @@ class DiskLayout:
         free_sectors = self.total_sectors - used_sectors
         return (free_sectors * 512) // (1024 * 1024)
 
+    @property
+    def signature(self) -> tuple:
+        """Hashable fingerprint of the layout (partition names, types, positions and sizes)"""
+        return (
+            tuple((p.name, p.category, p.start_sector, p.size_sectors, p.size_mb) for p in self.partitions),
+            self.total_sectors,
+            self.android_dynamic,
+            self.emummc_double
+        )
+
+    def rows(self) -> tuple:
+        """Per-partition display rows: (name, type name, start MB, size MB)"""
+        return tuple(
+            (p.name, p.type_name, p.start_sector * 512 // (1024 * 1024), p.size_mb)
+            for p in self.partitions
+        )
+
     def get_summary(self) -> str:
         """Get human-readable summary"""
         parts = []
@@ -2,9 +2,37 @@
 Disk Selector Widget - Select source and target disks
 """
 
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 
+from gui.styles import register_styles
+
+# Single worker for drive enumeration - WMI queries block for a long time on
+# some SD readers, so they must never run on the Tk thread
+_EXEC = ThreadPoolExecutor(max_workers=1)
+
+# Repeated refreshes within this window reuse the last enumeration
+_DRIVES_CACHE_TTL = 2.0
+
+# Minimum time (ms) the refresh button stays disabled after a refresh
+_REFRESH_COOLDOWN_MS = 500
+
+# How often (ms) the Tk thread checks whether the enumeration has finished
+_DRIVES_POLL_MS = 50
+
+# Fixed parts of the drive detection notices
+_MSG_MIGRATE_OK = "\n\n请从下拉菜单中选择源驱动器和目标驱动器。"
+_MSG_CLEANUP_OK = "\n\n请从下拉菜单中选择要清理的SD卡。"
+_MSG_MIGRATE_SHORT = (
+    "\n\n迁移模式需要两张已挂载的SD卡:\n"
+    "• 源SD卡 (较小容量)\n"
+    "• 目标SD卡 (较大容量)\n\n"
+    "请插入另一张SD卡并刷新。"
+)
+
 class DiskSelectorFrame(ttk.Frame):
     """Widget for selecting source and target disks"""
 
@@ -18,8 +46,19 @@ class DiskSelectorFrame(ttk.Frame):
 
         self.source_disk = None
         self.target_disk = None
-        self.disk_map = {}
-
+        self.disks = []  # Same order as the combobox values
+
+        # Last enumeration result and its hardware signature
+        self._drives_cache = None
+        self._drives_cache_time = 0
+        self._drives_sig = None
+        self._refreshing = False
+        self._target_visible = True  # Target selector is packed by _layout_widgets
+        self._pending_source = None
+        self._enabled = True
+        self._forbidden_target_paths = set()  # Disks that can't be the target
+
+        register_styles()
         self._create_widgets()
         self._layout_widgets()
 
@@ -47,13 +86,15 @@ class DiskSelectorFrame(ttk.Frame):
             state="readonly",
             width=25
         )
-        self.source_combobox.bind("<<ComboboxSelected>>", self._on_source_selected)
+        # Bind the registered Tcl command directly so Tk skips building an Event object
+        self.source_combobox.bind("<<ComboboxSelected>>", self.register(self._on_source_selected))
 
+        self._src_info_var = ttk.StringVar(value="未选择\n\n")  # Pre-allocate 3 lines with blank lines
         self.source_info = ttk.Label(
             self,
-            text="未选择\n\n",  # Pre-allocate 3 lines with blank lines
+            textvariable=self._src_info_var,
             font=("Segoe UI", 9),
-            bootstyle=INFO  # Blue color like the info panel on the right
+            style='Info.TLabel'  # Blue color like the info panel on the right
         )
 
         # Separator
@@ -71,13 +112,15 @@ class DiskSelectorFrame(ttk.Frame):
             state="readonly",
             width=25
         )
-        self.target_combobox.bind("<<ComboboxSelected>>", self._on_target_selected)
+        # Bind the registered Tcl command directly so Tk skips building an Event object
+        self.target_combobox.bind("<<ComboboxSelected>>", self.register(self._on_target_selected))
 
+        self._tgt_info_var = ttk.StringVar(value="未选择\n\n")  # Pre-allocate 3 lines with blank lines
         self.target_info = ttk.Label(
             self,
-            text="未选择\n\n",  # Pre-allocate 3 lines with blank lines
+            textvariable=self._tgt_info_var,
             font=("Segoe UI", 9),
-            bootstyle=INFO  # Blue color like the info panel on the right
+            style='Info.TLabel'  # Blue color like the info panel on the right
         )
 
         # Warning label
@@ -85,7 +128,7 @@ class DiskSelectorFrame(ttk.Frame):
             self,
             text="⚠️ 目标磁盘将被清空!",
             font=("Segoe UI", 9, "bold"),
-            bootstyle=DANGER
+            style='Danger.TLabel'
         )
 
     def _layout_widgets(self):
@@ -111,84 +154,93 @@ class DiskSelectorFrame(ttk.Frame):
 
     def _refresh_disks(self):
         """Refresh list of available drive letters (SD cards)"""
+        # Ignore clicks while a refresh is still running
+        if self._refreshing:
+            return
+        self._refreshing = True
+        self.refresh_button.config(state=DISABLED)
+
+        if (self._drives_cache is not None
+                and time.monotonic() - self._drives_cache_time < _DRIVES_CACHE_TTL):
+            self._on_drives_ready(self._drives_cache)
+            return
+
+        future = _EXEC.submit(self.disk_manager.list_drive_letters)
+        self.after(_DRIVES_POLL_MS, self._poll_drives, future)
+
+    def _poll_drives(self, future):
+        """Wait for the enumeration on the Tk thread (the worker never touches Tk)"""
+        if not future.done():
+            self.after(_DRIVES_POLL_MS, self._poll_drives, future)
+            return
+
         try:
-            drives = self.disk_manager.list_drive_letters()
+            drives = future.result()
+        except Exception as e:
+            self._on_drives_error(e)
+        else:
+            self._on_drives_ready(drives)
 
+    def _on_drives_error(self, error):
+        """Called on the Tk thread when drive enumeration fails"""
+        try:
+            if self.main_window:
+                self.main_window.show_custom_info(
+                    "错误",
+                    f"列出驱动器失败:\n\n{str(error)}",
+                    width=500,
+                    height=250
+                )
+        finally:
+            self.after(_REFRESH_COOLDOWN_MS, self._end_refresh)
+
+    def _end_refresh(self):
+        """Re-enable the refresh button once the cooldown has elapsed"""
+        self._refreshing = False
+        if self._enabled:
+            self.refresh_button.config(state=NORMAL)
+
+    def _on_drives_ready(self, drives):
+        """Populate the comboboxes with the enumerated drives (runs on the Tk thread)"""
+        try:
             if not drives:
                 if self.main_window:
-                    if self.main_window.current_mode == "cleanup":
-                        self.main_window.show_custom_info(
-                            "未找到SD卡",
-                            "未检测到可移动驱动器。请插入SD卡并刷新。",
-                            width=500,
-                            height=200
-                        )
-                    else:
-                        self.main_window.show_custom_info(
-                            "未找到SD卡",
-                            "未检测到可移动驱动器。请插入SD卡并刷新。",
-                            width=500,
-                            height=200
-                        )
-                return
-
-            # Build display names (show drive letter and total disk size)
-            drive_names = []
-            self.disk_map = {}
-
-            for drive in drives:
-                # Show: "H: - VOLUME_NAME (128.0 GB SD Card)"
-                volume_name = drive['name'] if drive['name'] != drive['letter'] else "SD 卡"
-                name = f"{drive['letter']} - {volume_name} ({drive['size_gb']:.1f} GB)"
-                drive_names.append(name)
-
-                # Map to full disk info (with physical drive path)
-                self.disk_map[name] = {
-                    'letter': drive['letter'],
-                    'name': drive['disk_name'],
-                    'path': drive['physical_drive'],  # This is the physical drive path like \\.\PhysicalDrive1
-                    'index': drive['physical_index'],
-                    'size_bytes': drive['size_bytes'],
-                    'size_gb': drive['size_gb'],
-                    'partition_size_gb': drive['partition_size_gb']
-                }
-
-            # Update comboboxes
-            self.source_combobox['values'] = drive_names
-            self.target_combobox['values'] = drive_names
-
-            # Show notification based on mode
-            if self.main_window:
-                if self.main_window.current_mode == "cleanup":
-                    # In cleanup mode, only need one SD card
                     self.main_window.show_custom_info(
-                        "检测到SD卡",
-                        f"成功检测到 {len(drives)} 张SD卡。\n\n"
-                        f"请从下拉菜单中选择要清理的SD卡。",
+                        "未找到SD卡",
+                        "未检测到可移动驱动器。请插入SD卡并刷新。",
                         width=500,
-                        height=250
+                        height=200
                     )
-                else:
-                    # In migration mode, need 2 SD cards
-                    if len(drives) >= 2:
-                        self.main_window.show_custom_info(
-                            "检测到SD卡",
-                            f"成功检测到 {len(drives)} 张SD卡。\n\n"
-                            f"请从下拉菜单中选择源驱动器和目标驱动器。",
-                            width=500,
-                            height=250
-                        )
-                    elif len(drives) == 1:
-                        self.main_window.show_custom_info(
-                            "SD卡数量不足",
-                            f"仅检测到 {len(drives)} 张SD卡。\n\n"
-                            f"迁移模式需要两张已挂载的SD卡:\n"
-                            f"• 源SD卡 (较小容量)\n"
-                            f"• 目标SD卡 (较大容量)\n\n"
-                            f"请插入另一张SD卡并刷新。",
-                            width=550,
-                            height=330
-                        )
+                return
+
+            self._drives_cache = drives
+            self._drives_cache_time = time.monotonic()
+
+            # Skip rebuilding the comboboxes when the same cards are still inserted
+            sig = tuple((d['letter'], d['size_bytes'], d['index']) for d in drives)
+            if sig == self._drives_sig:
+                self._show_detected_info(drives)
+                return
+            self._drives_sig = sig
+
+            # Earlier scans may describe a card that has since been removed
+            if self.main_window:
+                self.main_window.on_drives_refreshed()
+
+            # Build display names, e.g. "H: - VOLUME_NAME (128.0 GB)"
+            drive_names = [
+                f"{d['letter']} - {d['volume_name'] if d['volume_name'] != d['letter'] else 'SD 卡'} ({d['size_gb']:.1f} GB)"
+                for d in drives
+            ]
+            self.disks = drives
+
+            # Update comboboxes (only touch Tk when the list actually changed)
+            values = tuple(drive_names)
+            for cb in (self.source_combobox, self.target_combobox):
+                if cb.cget('values') != values:
+                    cb.configure(values=values)
+
+            self._show_detected_info(drives)
 
         except Exception as e:
             if self.main_window:
@@ -198,36 +250,84 @@ class DiskSelectorFrame(ttk.Frame):
                     width=500,
                     height=250
                 )
+        finally:
+            self.after(_REFRESH_COOLDOWN_MS, self._end_refresh)
+
+    def _show_detected_info(self, drives):
+        """Show notification about detected drives based on mode"""
+        if self.main_window:
+            if self.main_window.current_mode == "cleanup":
+                # In cleanup mode, only need one SD card
+                self.main_window.show_custom_info(
+                    "检测到SD卡",
+                    f"成功检测到 {len(drives)} 张SD卡。" + _MSG_CLEANUP_OK,
+                    width=500,
+                    height=250
+                )
+            else:
+                # In migration mode, need 2 SD cards
+                if len(drives) >= 2:
+                    self.main_window.show_custom_info(
+                        "检测到SD卡",
+                        f"成功检测到 {len(drives)} 张SD卡。" + _MSG_MIGRATE_OK,
+                        width=500,
+                        height=250
+                    )
+                elif len(drives) == 1:
+                    self.main_window.show_custom_info(
+                        "SD卡数量不足",
+                        f"仅检测到 {len(drives)} 张SD卡。" + _MSG_MIGRATE_SHORT,
+                        width=550,
+                        height=330
+                    )
 
-    def _on_source_selected(self, event):
+    def _on_source_selected(self):
         """Called when source disk is selected"""
-        selection = self.source_combobox.get()
-        if not selection:
+        # Ignore empty or stale selections (e.g. list replaced by a refresh)
+        index = self.source_combobox.current()
+        if not 0 <= index < len(self.disks):
             return
 
-        disk = self.disk_map[selection]
+        disk = self.disks[index]
         self.source_disk = disk
+        self._forbidden_target_paths = {disk['path']}
+
+        # Apply label update and callback in one idle pass - quick successive
+        # selections only apply the latest disk
+        if self._pending_source is None:
+            self.after_idle(self._apply_source_selection)
+        self._pending_source = disk
+
+    def _apply_source_selection(self):
+        """Apply the latest pending source selection"""
+        disk = self._pending_source
+        self._pending_source = None
+        if disk is None:
+            return
+
+        # Re-selecting the disk that is already shown changes nothing
+        info = f"驱动器: {disk['letter']}\n物理路径: {disk['path']}\n总容量: {disk['size_gb']:.2f} GB"
+        if self._src_info_var.get() == info:
+            return
 
         # Update info label
-        info = f"驱动器: {disk['letter']}\n"
-        info += f"物理路径: {disk['path']}\n"
-        info += f"总容量: {disk['size_gb']:.2f} GB"
-        self.source_info.config(text=info)
+        self._src_info_var.set(info)
 
         # Notify callback
         if self.on_source_selected:
             self.on_source_selected(disk)
 
-    def _on_target_selected(self, event):
+    def _on_target_selected(self):
         """Called when target disk is selected"""
-        selection = self.target_combobox.get()
-        if not selection:
+        # Ignore empty or stale selections (e.g. list replaced by a refresh)
+        index = self.target_combobox.current()
+        if not 0 <= index < len(self.disks):
             return
 
-        disk = self.disk_map[selection]
+        disk = self.disks[index]
 
         # Prevent selecting same disk as source
-        if self.source_disk and disk['path'] == self.source_disk['path']:
+        if disk['path'] in self._forbidden_target_paths:
             if self.main_window:
                 self.main_window.show_custom_info(
                     "无效选择",
@@ -240,24 +340,41 @@ class DiskSelectorFrame(ttk.Frame):
 
         self.target_disk = disk
 
+        # Re-selecting the disk that is already shown changes nothing
+        info = f"驱动器: {disk['letter']}\n物理路径: {disk['path']}\n总容量: {disk['size_gb']:.2f} GB"
+        if self._tgt_info_var.get() == info:
+            return
+
         # Update info label
-        info = f"驱动器: {disk['letter']}\n"
-        info += f"物理路径: {disk['path']}\n"
-        info += f"总容量: {disk['size_gb']:.2f} GB"
-        self.target_info.config(text=info)
+        self._tgt_info_var.set(info)
 
         # Notify callback
         if self.on_target_selected:
             self.on_target_selected(disk)
 
+    def _set_source_info(self, text):
+        """Update the source info label, skipping redundant redraws"""
+        if text != self._src_info_var.get():
+            self._src_info_var.set(text)
+
+    def _set_target_info(self, text):
+        """Update the target info label, skipping redundant redraws"""
+        if text != self._tgt_info_var.get():
+            self._tgt_info_var.set(text)
+
     def clear_target(self):
         """Clear target selection"""
-        self.target_combobox.set('')
+        if self.target_combobox.get():
+            self.target_combobox.set('')
         self.target_disk = None
-        self.target_info.config(text="未选择\n\n")  # Keep 3 lines to maintain spacing
+        self._set_target_info("未选择\n\n")  # Keep 3 lines to maintain spacing
 
     def show_target_selector(self):
         """Show target disk selector widgets (for migration mode)"""
+        if self._target_visible:
+            return
+        self._target_visible = True
+
         self.separator1.pack(fill=X, pady=10)
         self.target_label.pack(anchor=W, pady=(5, 2))
         self.target_combobox.pack(fill=X, pady=(0, 5))
@@ -266,6 +383,10 @@ class DiskSelectorFrame(ttk.Frame):
 
     def hide_target_selector(self):
         """Hide target disk selector widgets (for cleanup mode)"""
+        if not self._target_visible:
+            return
+        self._target_visible = False
+
         self.separator1.pack_forget()
         self.target_label.pack_forget()
         self.target_combobox.pack_forget()
@@ -274,13 +395,20 @@ class DiskSelectorFrame(ttk.Frame):
 
     def clear_selections(self):
         """Clear both source and target selections"""
-        self.source_combobox.set('')
+        if self.source_combobox.get():
+            self.source_combobox.set('')
         self.source_disk = None
-        self.source_info.config(text="未选择\n\n")
+        self._pending_source = None
+        self._forbidden_target_paths = set()
+        self._set_source_info("未选择\n\n")
         self.clear_target()
 
     def set_enabled(self, enabled):
         """Enable/disable disk selection"""
+        if self._enabled == enabled:
+            return
+        self._enabled = enabled
+
         state = "readonly" if enabled else DISABLED
         self.source_combobox.config(state=state)
         self.target_combobox.config(state=state)
@@ -4,24 +4,246 @@ Main GUI Window for SD Card Migrator
 
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
+import functools
 import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import messagebox
+from tkinter import font as tkfont
 import webbrowser
 import os
 import subprocess
 import sys
-import json
 import logging
+import time
 
 from gui.disk_selector import DiskSelectorFrame
 from gui.partition_viewer import PartitionViewerFrame
 from gui.migration_options import MigrationOptionsFrame
 from gui.progress_panel import ProgressPanel
 from gui.log_panel import LogPanel
+from gui.operation_modes import MigrationStrategy, CleanupStrategy
+from gui.styles import register_styles
 from core.disk_manager import DiskManager
 from core.partition_scanner import PartitionScanner
-from core.migration_engine import MigrationEngine
-from core.cleanup_engine import CleanupEngine
+
+# Worker threads post events to a queue that the Tk thread drains on a timer
+_PUMP_INTERVAL_MS = 33  # ~30 FPS
+_PUMP_MAX_EVENTS = 100  # Per tick, so a flood of events can't starve Tk
+
+# Delay before recalculating the layout after an option toggle
+_CALC_DEBOUNCE_MS = 150
+
+
+# Status and dialog text, filled in with str.format_map
+_MSG = {
+    'source_selected': "Source selected: {letter} - {name} ({size_gb:.1f} GB)",
+    'target_selected': "Target selected: {letter} - {name} ({size_gb:.1f} GB)",
+    'target_too_small': (
+        "目标磁盘 ({target[letter]}, {target[size_gb]:.1f} GB) 必须大于源磁盘 "
+        "({source[letter]}, {source[size_gb]:.1f} GB)"
+    ),
+}
+
+
+# Log panel visibility preference, stored as a single "show_log=0|1" line
+_PREFS_FILE = '.nx_migrator_prefs'
+_LEGACY_PREFS_FILE = '.nx_migrator_prefs.json'  # JSON written by older versions
+_PREFS_SAVE_DELAY_MS = 500  # Rapid toggles are written once
+
+
+# Log files written by main.enable_file_logging (older builds used the second prefix)
+_LOG_PREFIXES = ('nxmigratorpro_', 'nx_migrator_pro_')
+_LOG_SCAN_TTL = 5.0  # Seconds a located log file is reused without rescanning
+
+
+def _find_latest_log():
+    """Return the name of the most recently modified log file in the current directory, or None"""
+    latest = None
+    latest_mtime = -1.0
+    with os.scandir('.') as it:
+        for entry in it:
+            name = entry.name
+            if name.startswith(_LOG_PREFIXES) and name.endswith('.log'):
+                mtime = entry.stat().st_mtime
+                if mtime > latest_mtime:
+                    latest_mtime, latest = mtime, name
+    return latest
+
+
+def _open_file(path):
+    """Open a file with the platform's default application"""
+    if sys.platform == 'win32':
+        os.startfile(path)
+    elif sys.platform == 'darwin':
+        subprocess.run(['open', path])
+    else:
+        subprocess.run(['xdg-open', path])
+
+
+def _read_log_preference():
+    """Return the saved log panel visibility (False if nothing was saved)"""
+    for path in (_PREFS_FILE, _LEGACY_PREFS_FILE):
+        try:
+            with open(path, 'r') as f:
+                text = f.read().strip()
+        except OSError:
+            continue
+        if text.startswith('{'):
+            import json
+            return bool(json.loads(text).get('log_panel_visible', False))
+        return text == 'show_log=1'
+    return False
+
+
+# Help menu texts
+_USAGE_TEXT = """使用指南
+
+步骤1: 选择磁盘
+• 插入源SD卡(较小)和目标SD卡(较大)
+• 点击"刷新磁盘"来检测SD卡
+• 选择您的源SD卡(原始卡)
+• 选择您的目标SD卡(目标卡)
+
+警告: 目标磁盘将被完全擦除!
+
+步骤2: 扫描源SD卡
+• 点击"模拟迁移"
+• 等待扫描完成
+• 查看检测到的分区布局
+
+工具会自动检测:
+• FAT32分区 (hos_data)
+• Linux分区 (L4T)
+• Android分区 (动态或传统)
+• emuMMC分区 (单个或双虚拟系统)
+
+步骤3: 配置迁移
+选择要迁移的内容:
+• FAT32分区 (默认迁移，自动扩展)
+• Linux分区 (可选)
+• Android分区 (可选)
+• emuMMC分区 (可选)
+
+步骤4: 查看布局
+• 查看新的分区布局
+• 检查显示大小变化的对比
+• 验证FAT32扩展和可用空间
+
+步骤5: 开始迁移
+• 点击"开始迁移"
+• 确认警告对话框
+• 等待迁移完成 (128GB需要30-60分钟)
+
+迁移过程中请勿移除SD卡或关机!
+
+步骤6: 验证
+• 安全移除两张SD卡
+• 将目标SD卡插入任天堂Switch
+• 正常启动 - 所有数据和分区都已保留
+"""
+
+_TROUBLESHOOTING_TEXT = """故障排除
+
+"需要管理员权限"
+• 右键点击可执行文件并选择"以管理员身份运行"
+• 直接磁盘访问需要管理员权限
+
+"未找到SD卡"
+• 确保SD卡正确插入
+• 点击"刷新磁盘"重新扫描
+• 尝试不同的USB端口
+• 在设备管理器中检查SD卡读卡器
+• 确保SD卡未被其他程序挂载/使用
+
+"目标磁盘必须更大"
+• 确保目标SD卡实际上比源卡大
+• 某些SD卡报告的大小略有不同
+• 尝试容量更大的目标卡
+
+迁移失败
+• 检查SD卡连接
+• 尝试不同的SD卡读卡器
+• 验证目标SD卡未写保护
+• 检查目标SD卡是否有坏扇区
+• 关闭所有访问SD卡的程序
+• 在SD卡上运行磁盘检查 (chkdsk)
+
+迁移后emuMMC不工作
+• 工具会自动更新emuMMC扇区偏移
+• 如果问题持续，验证emuMMC/RAW1或emuMMC/RAW2
+  文件夹包含正确的偏移
+• 检查日志文件中的emuMMC更新错误
+• 确保已启用"迁移emuMMC"选项
+
+迁移速度慢
+• 使用高质量的SD卡读卡器 (USB 3.0+)
+• 避免USB集线器 - 直接连接到PC
+• 关闭后台程序以释放系统资源
+• 检查杀毒软件是否在扫描SD卡
+
+分区布局不正确
+• 验证源SD卡设置正确
+• 检查日志文件中的分区检测警告
+• 尝试重新扫描源磁盘
+• 确保最初使用了hekate分区管理器
+
+获取更多帮助:
+• 检查日志文件 (NXMigrator_YYYYMMDD_HHMMSS.log)
+• 在GitHub上报告问题并附上日志文件
+"""
+
+_ABOUT_TEMPLATE = """NX MIGRATOR PRO
+
+版本: {version}
+
+任天堂Switch SD卡专业分区管理工具。
+
+功能特性:
+• 迁移模式 - 从小容量SD卡迁移分区到大容量SD卡
+• 清理模式 - 删除不需要的分区并扩展FAT32
+
+支持格式: FAT32, Linux (L4T), Android, emuMMC
+
+版权所有 (c) 2025 Sthetix
+许可证: GPL-2.0
+
+为任天堂Switch自制软件社区制作
+
+---
+中文翻译 葡萄糖酸菜鱼;南宫镜
+此中文翻译版为非官方版本, 推荐使用官方英文版
+https://github.com/sthetix/NX-Migrator-Pro/releases
+"""
+
+
+def _scale_for_screen(screen_height):
+    """Dialog size factor for a screen height (scaled down for 1080p, a cosmetic improvement)"""
+    return 0.75 if screen_height < 1440 else 1.0
+
+
+def _guard(predicate, title, msg, width=450, height=200):
+    """Decorator: show an info dialog instead of running the method unless predicate(self) holds"""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrap(self, *args, **kwargs):
+            if not predicate(self):
+                self.show_custom_info(title, msg, width=width, height=height)
+                return None
+            return fn(self, *args, **kwargs)
+        return wrap
+    return deco
+
+
+def _has_layouts(window):
+    """True if a scan and a calculated target layout are both available"""
+    return window.source_layout is not None and window.target_layout is not None
+
+
+def _has_target(window):
+    """True if the current mode has the disks it needs (cleanup mode has no target)"""
+    return not window.strategy.needs_target or bool(window.target_disk)
+
 
 class MainWindow:
     """Main application window"""
@@ -30,14 +252,21 @@ class MainWindow:
         self.root = root
         self.disk_manager = DiskManager()
         self.scanner = PartitionScanner()
-        self.migration_engine = None
+        self.engine = None
+        self._operation_running = False  # Set from _start_migration until the result is shown
 
-        # State
-        self.current_mode = "migration"  # "migration" or "cleanup"
+        # State - the active strategy decides the mode (see current_mode)
+        self._strategies = {
+            strategy.mode: strategy
+            for strategy in (MigrationStrategy(self), CleanupStrategy(self))
+        }
+        self.strategy = self._strategies["migration"]
         self.source_disk = None
         self.target_disk = None
         self.source_layout = None
         self.target_layout = None
+        self._last_comparison = None  # (title, message, height) of the last calculated layout
+        self._comparison_cache = {}
         self.migration_options = {
             'migrate_fat32': True,
             'migrate_linux': True,
@@ -51,17 +280,86 @@ class MainWindow:
             'remove_emummc': False,
             'expand_fat32': True
         }
+        self._options = None  # Options snapshot last copied into the two dicts above
+        self._last_calc_key = None  # Inputs of the last target layout calculation
+        self._pending_calc = None  # after() id of the debounced layout recalculation
+
+        # Log panel preference: value waiting to be written, and the value on disk
+        self._pending_log_pref = None
+        self._saved_log_pref = None
+        self._prefs_after_id = None
+
+        # Blocking disk I/O (scans and operations) runs on this pool
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='io')
+
+        # Events posted by worker threads, applied on the Tk thread by _pump
+        self._ui_queue = queue.Queue()
+        self._ui_handlers = {
+            'scan_done': self._on_scan_complete,
+            'scan_error': self._on_scan_error,
+            'open_failed': self._on_open_failed,
+            'operation_result': self._apply_operation_result,
+        }
+
+        # Latest engine progress; the engine thread overwrites it, _pump applies it
+        self._progress_lock = threading.Lock()
+        self._progress_slot = None
+
+        # Latest status text / (stage, percent), applied once per idle cycle
+        self._idle_status = None
+        self._idle_progress = None
+        self._idle_pending = False
+
+        # Requested enabled state of the controls, applied by _apply_ui_enabled
+        self._pending_ui_enabled = None
+        self._ui_enabled_scheduled = False
+
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        register_styles()
 
         # Build UI
         self._create_menu()
         self._create_widgets()
         self._layout_widgets()
 
+        # Main window geometry (x, y, width, height), kept current for centering dialogs
+        self._parent_geom = None
+        self._dialog_scale = _scale_for_screen(self.root.winfo_screenheight())
+        self._dialogs = {}  # Help dialogs by title, reused between opens
+        self._mono_font = None  # Shared by the help dialogs, created on first use
+        self._last_log = None  # (monotonic time, name) of the last log file lookup
+
+        # Get version from main module for the about dialog
+        try:
+            import __main__
+            version = getattr(__main__, '__version__', '1.0.0')
+        except:
+            version = '1.0.0'
+        self._about_text = _ABOUT_TEMPLATE.format(version=version)
+        self.root.bind('<Configure>', self._cache_geom, add='+')
+
         # Bind keyboard shortcut for log toggle (Ctrl+L)
         self.root.bind('<Control-l>', lambda e: self._toggle_log_panel())
 
-        # Load preferences and restore log panel state
-        self._load_log_preference()
+        # Load preferences and restore log panel state once the window has painted
+        self.root.after_idle(self._load_log_preference)
+
+        # Start draining worker-thread events
+        self._pump()
+
+    def _pump(self):
+        """Apply events queued by worker threads (runs on the Tk thread)"""
+        # Schedule the next tick first - some handlers open modal dialogs, and
+        # wait_window keeps servicing timers, so the queue still drains meanwhile
+        self.root.after(_PUMP_INTERVAL_MS, self._pump)
+
+        for _ in range(_PUMP_MAX_EVENTS):
+            try:
+                event, *args = self._ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            self._ui_handlers[event](*args)
+        self._apply_progress_slot()
 
     def _create_menu(self):
         """Create menu bar"""
@@ -111,7 +409,7 @@ class MainWindow:
         self.migration_mode_btn = ttk.Button(
             self.mode_frame,
             text="🔄 迁移模式",
-            command=lambda: self._switch_mode("migration"),
+            command=functools.partial(self._switch_mode, "migration"),
             bootstyle="primary",
             width=20
         )
@@ -120,7 +418,7 @@ class MainWindow:
         self.cleanup_mode_btn = ttk.Button(
             self.mode_frame,
             text="🧹 清理模式",
-            command=lambda: self._switch_mode("cleanup"),
+            command=functools.partial(self._switch_mode, "cleanup"),
             bootstyle="secondary-outline",
             width=20
         )
@@ -175,11 +473,9 @@ class MainWindow:
             title="📀 源SD卡"
         )
 
-        # Target partition view
-        self.target_partition_frame = PartitionViewerFrame(
-            self.middle_panel,
-            title="💾 目标SD卡 (迁移后)"
-        )
+        # Target partition view (built on first use by _ensure_target_frame)
+        self.target_partition_frame = None
+        self._target_frame_title = "💾 目标SD卡 (迁移后)"
 
         # Right Panel - Migration Options
         self.right_panel = ttk.Labelframe(
@@ -204,6 +500,16 @@ class MainWindow:
             state=DISABLED
         )
 
+        # Layout summary button (shows the last calculated comparison)
+        self.summary_button = ttk.Button(
+            self.right_panel,
+            text="📋 查看摘要",
+            command=self._show_layout_comparison,
+            bootstyle="info-outline",
+            width=30,
+            state=DISABLED
+        )
+
         # ===== Bottom Panel - Progress =====
         self.bottom_frame = ttk.Frame(self.root)
 
@@ -233,6 +539,13 @@ class MainWindow:
             width=12
         )
 
+        # Bound methods used on every progress update
+        self._progress_update = self.progress_panel.update
+        # Status text is set with a raw Tcl "configure -text", skipping the
+        # Python-side option handling of config()
+        self._tk_call = self.root.tk.call
+        self._status_label_path = str(self.status_label)
+
     def _layout_widgets(self):
         """Layout all widgets"""
 
@@ -268,11 +581,10 @@ class MainWindow:
         separator = ttk.Separator(self.middle_panel, orient='horizontal')
         separator.grid(row=1, column=0, sticky='ew', pady=2.5)
 
-        self.target_partition_frame.grid(row=2, column=0, sticky='nsew', pady=(2.5, 0))
-
         # Right panel content
         self.migration_options_frame.pack(fill=BOTH, expand=YES)
         self.migrate_button.pack(pady=(10, 0))
+        self.summary_button.pack(pady=(5, 0))
 
         # Bottom panel
         self.bottom_frame.pack(fill=X, padx=8, pady=5)
@@ -286,89 +598,122 @@ class MainWindow:
         self.status_label.pack(side=LEFT, pady=5, padx=10)
         self.log_toggle_btn.pack(side=RIGHT, pady=5, padx=10)
 
+    def _ensure_target_frame(self):
+        """Create the target partition view the first time a layout is shown"""
+        if self.target_partition_frame is None:
+            self.target_partition_frame = PartitionViewerFrame(
+                self.middle_panel,
+                title=self._target_frame_title
+            )
+            self.target_partition_frame.grid(row=2, column=0, sticky='nsew', pady=(2.5, 0))
+        return self.target_partition_frame
+
+    def _set_target_frame_title(self, title):
+        """Set the target partition view title (applied on creation if not built yet)"""
+        self._target_frame_title = title
+        if self.target_partition_frame is not None:
+            self.target_partition_frame.update_title(title)
+
+    @property
+    def current_mode(self):
+        """Name of the active mode ("migration" or "cleanup")"""
+        return self.strategy.mode
+
     def _switch_mode(self, mode):
         """Switch between migration and cleanup modes"""
         if self.current_mode == mode:
             return  # Already in this mode
 
-        self.current_mode = mode
+        self.strategy = strategy = self._strategies[mode]
+        self._options = None  # Options must be re-applied for the new mode
 
-        # Update button styles
-        if mode == "migration":
-            self.migration_mode_btn.config(bootstyle="primary")
-            self.cleanup_mode_btn.config(bootstyle="secondary-outline")
+        # Apply all per-mode widget options, one configure() per widget
+        for name, kwargs in strategy.widget_state.items():
+            getattr(self, name).configure(**kwargs)
 
-            # Update UI labels for migration mode
-            self.left_panel.config(text="步骤1: 选择源和目标磁盘")
-            self.middle_panel.config(text="步骤2: 查看分区")
-            self.right_panel.config(text="步骤3: 迁移选项")
-            self.scan_button.config(text="🔍 模拟迁移")
-            self.migrate_button.config(text="🚀 开始迁移")
-            self.source_partition_frame.update_title("📀 源SD卡")
-            self.target_partition_frame.update_title("💾 目标SD卡 (迁移后)")
-            self._update_status("迁移模式: 选择源和目标SD卡，然后点击'模拟迁移'。")
+        self.source_partition_frame.update_title(strategy.source_title)
+        self._set_target_frame_title(strategy.target_title)
+        self._update_status(strategy.ready_status)
 
-            # Show target disk selector
+        # The target disk selector is only used in migration mode
+        if strategy.needs_target:
             self.disk_selector.show_target_selector()
-
-            # Set options frame to migration mode
-            self.migration_options_frame.set_mode("migration")
-
-        else:  # cleanup mode
-            self.migration_mode_btn.config(bootstyle="secondary-outline")
-            self.cleanup_mode_btn.config(bootstyle="success")
-
-            # Update UI labels for cleanup mode
-            self.left_panel.config(text="步骤1: 选择SD卡")
-            self.middle_panel.config(text="步骤2: 查看当前分区")
-            self.right_panel.config(text="步骤3: 清理选项")
-            self.scan_button.config(text="🔍 扫描SD卡")
-            self.migrate_button.config(text="🧹 开始清理")
-            self.source_partition_frame.update_title("📀 当前SD卡布局")
-            self.target_partition_frame.update_title("✨ 清理后 (预览)")
-            self._update_status("清理模式: 选择要清理不需要分区的SD卡。")
-
-            # Hide target disk selector in cleanup mode
+        else:
             self.disk_selector.hide_target_selector()
 
-            # Set options frame to cleanup mode
-            self.migration_options_frame.set_mode("cleanup")
+        # Set options frame to the new mode
+        self.migration_options_frame.set_mode(mode)
 
-        # Reset state
+        # Reset state (set_mode above re-synced the options and may have
+        # scheduled a recalculation for the old layout)
+        self._cancel_pending_calc()
         self.source_disk = None
         self.target_disk = None
         self.source_layout = None
         self.target_layout = None
         self.source_partition_frame.clear()
-        self.target_partition_frame.clear()
-        self.migrate_button.config(state=DISABLED)
+        if self.target_partition_frame is not None:
+            self.target_partition_frame.clear()
         self.disk_selector.clear_selections()
 
         # Reset progress panel with current mode
         self.progress_panel.reset(mode)
 
+    def on_drives_refreshed(self):
+        """Called by the disk selector when a refresh found a different set of drives"""
+        # The cards changed, so a scan or preview of the selected disks can no
+        # longer be trusted - unless an operation is already using them
+        if self._operation_running:
+            return
+        if self.source_layout is None and self.target_layout is None:
+            return
+
+        self.source_layout = None
+        self.target_layout = None
+        self.source_partition_frame.clear()
+        if self.target_partition_frame is not None:
+            self.target_partition_frame.clear()
+        self.migrate_button.config(state=DISABLED)
+        self.summary_button.config(state=DISABLED)
+
+        self._update_status("驱动器已刷新。请重新扫描。")
+
     def _on_source_selected(self, disk_info):
         """Called when source disk is selected"""
+        # Reselecting the same disk keeps the current scan and preview
+        if self.source_disk and disk_info['path'] == self.source_disk['path']:
+            return
+
         self.source_disk = disk_info
         self.source_layout = None
         self.source_partition_frame.clear()
-        self.target_partition_frame.clear()
+        # A calculated target layout was derived from the old source
+        if self.target_layout is not None:
+            self.target_layout = None
+            if self.target_partition_frame is not None:
+                self.target_partition_frame.clear()
         self.migrate_button.config(state=DISABLED)
+        self.summary_button.config(state=DISABLED)
 
-        self._update_status(f"Source selected: {disk_info['letter']} - {disk_info['name']} ({disk_info['size_gb']:.1f} GB)")
+        self._update_status(_MSG['source_selected'].format_map(disk_info))
 
     def _on_target_selected(self, disk_info):
         """Called when target disk is selected"""
+        if self.target_disk and disk_info['path'] == self.target_disk['path']:
+            return
+
         self.target_disk = disk_info
         self.target_layout = None
-        self.target_partition_frame.clear()
+        if self.target_partition_frame is not None:
+            self.target_partition_frame.clear()
         self.migrate_button.config(state=DISABLED)
+        self.summary_button.config(state=DISABLED)
 
         # Validate target is larger than source
         if self.source_disk and disk_info['size_bytes'] <= self.source_disk['size_bytes']:
             self.show_custom_info(
                 "无效目标",
-                f"目标磁盘 ({disk_info['letter']}, {disk_info['size_gb']:.1f} GB) 必须大于源磁盘 ({self.source_disk['letter']}, {self.source_disk['size_gb']:.1f} GB)",
+                _MSG['target_too_small'].format_map({'target': disk_info, 'source': self.source_disk}),
                 width=500,
                 height=200
             )
@@ -376,48 +721,49 @@ class MainWindow:
             self.target_disk = None
             return
 
-        self._update_status(f"Target selected: {disk_info['letter']} - {disk_info['name']} ({disk_info['size_gb']:.1f} GB)")
+        self._update_status(_MSG['target_selected'].format_map(disk_info))
 
     def _on_options_changed(self, options):
         """Called when migration/cleanup options change"""
-        if self.current_mode == "migration":
-            self.migration_options = options
-        else:  # cleanup mode
-            # Convert options to cleanup options format
-            # In cleanup mode, checked = remove
-            self.cleanup_options = {
-                'remove_linux': options['migrate_linux'],  # Note: inverted meaning
-                'remove_android': options['migrate_android'],
-                'remove_emummc': options['migrate_emummc'],
-                'expand_fat32': options['expand_fat32']
-            }
-
-        # Recalculate layout if we already have source layout
-        if self.current_mode == "migration":
-            if self.source_layout and self.target_disk:
-                self._calculate_layout()
-        else:  # cleanup mode
-            if self.source_layout:
-                self._calculate_layout()
-
+        # Nothing to recalculate if the toggles ended up where they were
+        if options == self._options:
+            return
+        self._sync_options(options)
+
+        # Recalculate layout once the toggles settle - the last change wins
+        self._cancel_pending_calc()
+        if self._can_recalculate():
+            # Don't allow starting with a layout that no longer matches the options
+            self.migrate_button.config(state=DISABLED)
+            self._pending_calc = self.root.after(_CALC_DEBOUNCE_MS, self._run_pending_calc)
+
+    def _sync_options(self, options):
+        """Copy an options snapshot into the long-lived option dicts"""
+        self._options = options
+        self.strategy.sync_options(options)
+
+    def _can_recalculate(self):
+        """Whether there is enough information to recalculate the target layout"""
+        return bool(self.source_layout) and _has_target(self)
+
+    def _run_pending_calc(self):
+        """Debounced layout recalculation after option changes"""
+        self._pending_calc = None
+        if self._can_recalculate():
+            self._calculate_layout(show_dialog=False)
+
+    def _cancel_pending_calc(self):
+        """Cancel a scheduled layout recalculation"""
+        if self._pending_calc is not None:
+            self.root.after_cancel(self._pending_calc)
+            self._pending_calc = None
+
+    @_guard(lambda self: self.source_disk, "未选择磁盘", "请先选择一个SD卡。")
+    @_guard(_has_target, "未选择目标磁盘", "请选择源和目标SD卡。")
     def _scan_sd_cards(self):
         """Scan SD card and simulate layout (works for both migration and cleanup modes)"""
-        if not self.source_disk:
-            self.show_custom_info("未选择磁盘", "请先选择一个SD卡。", width=450, height=200)
-            return
-
-        # In migration mode, require target disk
-        if self.current_mode == "migration":
-            if not self.target_disk:
-                self.show_custom_info("未选择目标磁盘", "请选择源和目标SD卡。", width=450, height=200)
-                return
-
-        if self.current_mode == "migration":
-            self._update_status("正在扫描源磁盘并模拟迁移...")
-            self.scan_button.config(state=DISABLED, text="⏳ 模拟中...")
-        else:  # cleanup mode
-            self._update_status("正在扫描SD卡并模拟清理...")
-            self.scan_button.config(state=DISABLED, text="⏳ 扫描中...")
+        self._update_status(self.strategy.scan_status)
+        self.scan_button.config(state=DISABLED, text=self.strategy.scan_busy_text)
 
         # Run scan in thread to avoid blocking UI
         def scan_thread():
@@ -426,22 +772,18 @@ class MainWindow:
                 source_layout = self.scanner.scan_disk(self.source_disk['path'])
 
                 # Update UI in main thread
-                self.root.after(0, self._on_scan_complete, source_layout, None)
+                self._ui_queue.put(('scan_done', source_layout))
 
             except Exception as e:
-                self.root.after(0, self._on_scan_error, str(e))
+                self._ui_queue.put(('scan_error', str(e)))
 
-        threading.Thread(target=scan_thread, daemon=True).start()
+        self._io_pool.submit(scan_thread)
 
     def _on_scan_complete(self, source_layout, target_layout=None):
         """Called when disk scan completes"""
         self.source_layout = source_layout
 
-        # Update button text based on mode
-        if self.current_mode == "migration":
-            self.scan_button.config(state=NORMAL, text="🔍 模拟迁移")
-        else:
-            self.scan_button.config(state=NORMAL, text="🔍 扫描SD卡")
+        self.scan_button.config(state=NORMAL, text=self.strategy.scan_idle_text)
 
         # Display source partition information
         self.source_partition_frame.display_layout(source_layout, self.source_disk)
@@ -455,32 +797,17 @@ class MainWindow:
         )
 
         # Sync the options from the frame to ensure we use the correct state
-        if self.current_mode == "migration":
-            self.migration_options = self.migration_options_frame.options.copy()
-        else:
-            # Convert to cleanup options format
-            options = self.migration_options_frame.options
-            self.cleanup_options = {
-                'remove_linux': options['migrate_linux'],
-                'remove_android': options['migrate_android'],
-                'remove_emummc': options['migrate_emummc'],
-                'expand_fat32': options['expand_fat32']
-            }
+        self._sync_options(self.migration_options_frame.options)
 
         # Update status
-        summary = source_layout.get_summary()
-
-        if self.current_mode == "migration":
-            self._update_status(f"扫描完成: {summary}。正在计算目标布局...")
-        else:
-            self._update_status(f"扫描完成: {summary}。选择清理选项并计算预览...")
+        self._update_status(self.strategy.scan_done_status.format(summary=source_layout.get_summary()))
 
         # Automatically calculate and display the simulated target layout
-        self._calculate_layout()
+        self._calculate_layout(show_dialog=True)
 
     def _on_scan_error(self, error_msg):
         """Called when disk scan fails"""
-        self.scan_button.config(state=NORMAL, text="🔍 模拟迁移")
+        self.scan_button.config(state=NORMAL, text=self.strategy.scan_idle_text)
 
         self.show_custom_info(
             "扫描失败",
@@ -491,75 +818,46 @@ class MainWindow:
 
         self._update_status("扫描失败。请重试。")
 
-    def _calculate_layout(self):
-        """Calculate new partition layout (for both migration and cleanup modes)"""
-        if not self.source_layout:
-            self.show_custom_info(
-                "缺少信息",
-                "请先扫描 SD 卡。",
-                width=500,
-                height=200
-            )
-            return
-
-        # In migration mode, require target disk
-        if self.current_mode == "migration" and not self.target_disk:
-            self.show_custom_info(
-                "缺少信息",
-                "请先选择目标磁盘。",
-                width=500,
-                height=200
-            )
-            return
+    @_guard(lambda self: self.source_layout, "缺少信息", "请先扫描 SD 卡。", width=500)
+    @_guard(_has_target, "缺少信息", "请先选择目标磁盘。", width=500)
+    def _calculate_layout(self, show_dialog=True):
+        """Calculate new partition layout (for both migration and cleanup modes)
 
+        Args:
+            show_dialog: Show the layout comparison once calculated (off for option toggles)
+        """
         try:
             self._update_status("正在计算新分区布局...")
 
-            if self.current_mode == "migration":
-                # Migration mode: calculate layout for target disk
-                new_layout = self.scanner.calculate_target_layout(
-                    self.source_layout,
-                    self.target_disk['size_bytes'],
-                    self.migration_options
-                )
+            strategy = self.strategy
+            disk = strategy.layout_disk()
+            options = strategy.options
 
-                self.target_layout = new_layout
-
-                # Display new layout
-                self.target_partition_frame.display_layout(new_layout, self.target_disk)
-
-            else:  # cleanup mode
-                # Cleanup mode: calculate layout for same disk (with partitions removed)
-                # Use cleanup options to determine what to remove
-                cleanup_options_for_calc = {
-                    'migrate_fat32': True,  # Always keep FAT32
-                    'migrate_linux': not self.cleanup_options['remove_linux'],
-                    'migrate_android': not self.cleanup_options['remove_android'],
-                    'migrate_emummc': not self.cleanup_options['remove_emummc'],
-                    'expand_fat32': self.cleanup_options['expand_fat32']
-                }
-
-                new_layout = self.scanner.calculate_target_layout(
-                    self.source_layout,
-                    self.source_disk['size_bytes'],  # Same disk size
-                    cleanup_options_for_calc
-                )
-
-                self.target_layout = new_layout
+            # Skip the calculation if nothing it depends on has changed
+            calc_key = (
+                self.current_mode,
+                self.source_layout.signature,
+                disk['size_bytes'],
+                frozenset(options.items())
+            )
+            if calc_key != self._last_calc_key or self.target_layout is None:
+                self.target_layout = strategy.calculate()
+                self._last_calc_key = calc_key
 
-                # Display new layout (use source disk info since it's the same disk)
-                self.target_partition_frame.display_layout(new_layout, self.source_disk)
+            # Display new layout
+            self._display_target_layout(self.target_layout, disk)
 
-            # Show comparison
-            self._show_layout_comparison()
+            # Prepare comparison (also available on demand via the summary button)
+            self._last_comparison = self._build_layout_comparison()
+            self.summary_button.config(state=NORMAL)
 
             # Enable action button
             self.migrate_button.config(state=NORMAL)
 
-            if self.current_mode == "migration":
-                self._update_status("布局计算完成。准备开始迁移。")
-            else:
-                self._update_status("清理预览准备完成。准备开始清理。")
+            self._update_status(strategy.calc_done_status)
+
+            if show_dialog:
+                self._show_layout_comparison()
 
         except Exception as e:
             self.show_custom_info(
@@ -570,306 +868,177 @@ class MainWindow:
             )
             self._update_status("布局计算失败。")
 
-    def _show_layout_comparison(self):
-        """Show comparison between source and target layouts"""
-        if not self.source_layout or not self.target_layout:
+    def _display_target_layout(self, layout, disk_info):
+        """Show the calculated layout, skipping the redraw if it is already displayed"""
+        frame = self._ensure_target_frame()
+        if (frame.layout is not None and frame.disk_info is disk_info
+                and frame.layout.signature == layout.signature):
             return
+        frame.display_layout(layout, disk_info)
 
-        # Build comparison message based on mode
-        if self.current_mode == "migration":
-            msg = "迁移摘要：\n\n"
-
-            # FAT32
-            if self.migration_options['migrate_fat32']:
-                src_fat = self.source_layout.get_fat32_size_mb()
-                dst_fat = self.target_layout.get_fat32_size_mb()
-                fat32_gain = dst_fat - src_fat
-                if self.migration_options['expand_fat32']:
-                    msg += f"✓ FAT32: {src_fat:,} MB → {dst_fat:,} MB (+{fat32_gain:,} MB 扩展)\n"
-                else:
-                    msg += f"✓ FAT32: {src_fat:,} MB → {dst_fat:,} MB (无扩展)\n"
-
-            # Linux
-            if self.source_layout.has_linux and self.migration_options['migrate_linux']:
-                linux_size = self.source_layout.get_linux_size_mb()
-                msg += f"✓ Linux: {linux_size:,} MB (preserved)\n"
-
-            # Android
-            if self.source_layout.has_android and self.migration_options['migrate_android']:
-                android_size = self.source_layout.get_android_size_mb()
-                android_type = "动态" if self.source_layout.android_dynamic else "传统"
-                msg += f"✓ Android ({android_type}): {android_size:,} MB (保持)\n"
-
-            # emuMMC
-            if self.source_layout.has_emummc and self.migration_options['migrate_emummc']:
-                emummc_size = self.source_layout.get_emummc_size_mb()
-                emummc_type = "双虚拟系统" if self.source_layout.emummc_double else "单虚拟系统"
-                msg += f"✓ emuMMC ({emummc_type}): {emummc_size:,} MB (保持)\n"
-
-            msg += f"\n源磁盘：{self.source_disk['size_gb']:.1f} GB\n"
-            msg += f"目标磁盘：{self.target_disk['size_gb']:.1f} GB"
-
-            self.show_custom_info("布局对比", msg, width=550, height=400)
-
-        else:  # cleanup mode
-            msg = "Cleanup Summary:\n\n"
-
-            # FAT32
-            src_fat = self.source_layout.get_fat32_size_mb()
-            dst_fat = self.target_layout.get_fat32_size_mb()
-            fat32_gain = dst_fat - src_fat
-            if self.cleanup_options['expand_fat32']:
-                msg += f"✓ FAT32: {src_fat:,} MB → {dst_fat:,} MB (+{fat32_gain:,} MB 回收)\n"
-            else:
-                msg += f"✓ FAT32: {src_fat:,} MB (无扩展)\n"
-
-            # Linux
-            if self.source_layout.has_linux:
-                linux_size = self.source_layout.get_linux_size_mb()
-                if self.cleanup_options['remove_linux']:
-                    msg += f"✗ Linux: {linux_size:,} MB (will be REMOVED)\n"
-                else:
-                    msg += f"✓ Linux: {linux_size:,} MB (preserved)\n"
-
-            # Android
-            if self.source_layout.has_android:
-                android_size = self.source_layout.get_android_size_mb()
-                android_type = "动态" if self.source_layout.android_dynamic else "传统"
-                if self.cleanup_options['remove_android']:
-                    msg += f"✗ Android ({android_type}): {android_size:,} MB (将被删除)\n"
-                else:
-                    msg += f"✓ Android ({android_type}): {android_size:,} MB (保持)\n"
-
-            # emuMMC
-            if self.source_layout.has_emummc:
-                emummc_size = self.source_layout.get_emummc_size_mb()
-                emummc_type = "双虚拟系统" if self.source_layout.emummc_double else "单虚拟系统"
-                if self.cleanup_options['remove_emummc']:
-                    msg += f"✗ emuMMC ({emummc_type}): {emummc_size:,} MB (将被删除)\n"
-                else:
-                    msg += f"✓ emuMMC ({emummc_type}): {emummc_size:,} MB (保持)\n"
-
-            msg += f"\nSD 卡：{self.source_disk['size_gb']:.1f} GB"
-
-            self.show_custom_info("清理摘要", msg, width=550, height=380)
+    def _show_layout_comparison(self):
+        """Show comparison between source and target layouts"""
+        if self._last_comparison:
+            title, msg, height = self._last_comparison
+            self.show_custom_info(title, msg, width=550, height=height)
 
+    def _build_layout_comparison(self):
+        """Build (title, message, height) comparing source and target layouts (memoized)"""
+        if not self.source_layout or not self.target_layout:
+            return None
+
+        strategy = self.strategy
+        target_gb = self.target_disk['size_gb'] if strategy.needs_target else None
+        key = (
+            self.current_mode,
+            self.source_layout.signature,
+            self.target_layout.signature,
+            frozenset(strategy.options.items()),
+            self.source_disk['size_gb'],
+            target_gb
+        )
+        cached = self._comparison_cache.get(key)
+        if cached is None:
+            if len(self._comparison_cache) >= 32:
+                self._comparison_cache.clear()
+            cached = self._comparison_cache[key] = strategy.format_comparison()
+        return cached
+
+    @_guard(_has_layouts, "缺少信息", "请先扫描 SD 卡。", width=500)
     def _start_migration(self):
         """Start the migration or cleanup process (depending on mode)"""
 
-        if self.current_mode == "migration":
-            # Migration mode confirmations
-            response = self.show_custom_confirm(
-                "确认迁移",
-                f"⚠️ 警告 ⚠️\n\n"
-                f"这将会清除目标磁盘上的所有数据：\n"
-                f"{self.target_disk['letter']} - {self.target_disk['name']} ({self.target_disk['size_gb']:.1f} GB)\n\n"
-                f"源磁盘 ({self.source_disk['letter']}) 不会被修改。\n\n"
-                f"您确定要继续吗？",
-                yes_text="是的，继续",
-                no_text="取消",
-                style="warning",
-                width=550,
-                height=400
-            )
-
-            if not response:
-                return
-
-            # Double confirmation
-            response2 = self.show_custom_confirm(
-                "最终确认",
-                f"⚠️ 最后警告 ⚠️\n\n"
-                f"{self.target_disk['letter']} ({self.target_disk['name']}) 上的所有数据将被永久清除。\n\n"
-                f"此操作无法撤销！",
-                yes_text="是的，清除并迁移",
-                no_text="取消",
-                style="danger",
-                width=550,
-                height=330
-            )
-
-            if not response2:
-                return
-
-            # Enable file logging for this operation
-            from main import enable_file_logging
-            log_file = enable_file_logging()
-            logging.getLogger(__name__).info(f"Migration operation started - logging to {log_file}")
-
-            # Disable UI during migration
-            self._set_ui_enabled(False)
-
-            # Create migration engine
-            self.migration_engine = MigrationEngine(
-                self.source_disk,
-                self.target_disk,
-                self.source_layout,
-                self.target_layout,
-                self.migration_options
-            )
-
-            # Connect progress callbacks
-            self.migration_engine.on_progress = self._on_operation_progress
-            self.migration_engine.on_complete = self._on_operation_complete
-            self.migration_engine.on_error = self._on_operation_error
-
-            # Start migration in thread
-            self._update_status("迁移进行中...")
-            self.progress_panel.start()
-
-            threading.Thread(
-                target=self.migration_engine.run,
-                daemon=True
-            ).start()
-
-        else:  # cleanup mode
-            # Cleanup mode confirmations
-            removed_parts = []
-            if self.cleanup_options['remove_linux'] and self.source_layout.has_linux:
-                removed_parts.append("Linux partition")
-            if self.cleanup_options['remove_android'] and self.source_layout.has_android:
-                removed_parts.append("Android partitions")
-            if self.cleanup_options['remove_emummc'] and self.source_layout.has_emummc:
-                removed_parts.append("emuMMC partition(s)")
-
-            if removed_parts:
-                parts_str = ", ".join(removed_parts)
-            else:
-                parts_str = "No partitions will be removed (only FAT32 expansion)"
-
-            response = self.show_custom_confirm(
-                "Confirm Cleanup",
-                f"⚠️ WARNING ⚠️\n\n"
-                f"This will MODIFY the disk:\n"
-                f"{self.source_disk['letter']} - {self.source_disk['name']} ({self.source_disk['size_gb']:.1f} GB)\n\n"
-                f"Partitions to remove:\n{parts_str}\n\n"
-                f"FAT32 data will be backed up temporarily, then restored.\n\n"
-                f"⚠️ IMPORTANT: Make sure you have a backup of your SD card!\n\n"
-                f"Are you sure you want to continue?",
-                yes_text="Yes, Continue",
-                no_text="Cancel",
-                style="warning",
-                width=600,
-                height=500
-            )
-
-            if not response:
-                return
-
-            # Double confirmation
-            response2 = self.show_custom_confirm(
-                "最终确认",
-                f"⚠️ 最后警告 ⚠️\n\n"
-                f"磁盘 {self.source_disk['letter']} 将被修改。\n"
-                f"删除的分区将被永久删除。\n\n"
-                f"此操作无法撤销！\n\n"
-                f"您是否已有备份？",
-                yes_text="是的，我已备份 - 继续",
-                no_text="取消",
-                style="danger",
-                width=550,
-                height=400
-            )
-
-            if not response2:
-                return
-
-            # Enable file logging for this operation
-            from main import enable_file_logging
-            log_file = enable_file_logging()
-            logging.getLogger(__name__).info(f"Cleanup operation started - logging to {log_file}")
-
-            # Disable UI during cleanup
-            self._set_ui_enabled(False)
+        strategy = self.strategy
+        if not strategy.confirm():
+            return
 
-            # Create cleanup engine
-            self.cleanup_engine = CleanupEngine(
-                self.source_disk,
-                self.source_layout,
-                self.target_layout,
-                self.cleanup_options
+        # Enable file logging for this operation
+        from main import enable_file_logging
+        log_file = enable_file_logging()
+        self._last_log = None  # A newer log file now exists
+        logging.getLogger(__name__).info(f"{strategy.log_name} operation started - logging to {log_file}")
+
+        # Disable UI during the operation
+        self._set_ui_enabled(False)
+
+        # Create the engine and connect progress callbacks
+        self.engine = strategy.create_engine()
+        self.engine.on_progress = self._on_operation_progress
+        self.engine.on_complete = self._on_operation_complete
+        self.engine.on_error = self._on_operation_error
+
+        # Start the operation in a worker thread
+        self._update_status(strategy.running_status)
+        self.progress_panel.start()
+
+        self._operation_running = True
+        self._io_pool.submit(self.engine.run).add_done_callback(self._on_operation_done)
+
+    def _on_operation_done(self, future):
+        """Report exceptions that escaped engine.run (runs on the worker thread)"""
+        # The engines report their own failures through on_error
+        if not future.cancelled() and future.exception() is not None:
+            self._on_operation_error(str(future.exception()))
+
+    def _on_close(self):
+        """Stop the worker pool and close the window"""
+        # The pool threads are not daemons - closing now would only hide the
+        # window while the engine keeps writing to the disk
+        if self._operation_running:
+            self.show_custom_info(
+                "操作进行中",
+                "正在写入SD卡,请等待操作完成后再关闭窗口。",
+                width=450,
+                height=200
             )
+            return
 
-            # Connect progress callbacks
-            self.cleanup_engine.on_progress = self._on_operation_progress
-            self.cleanup_engine.on_complete = self._on_operation_complete
-            self.cleanup_engine.on_error = self._on_operation_error
-
-            # Start cleanup in thread
-            self._update_status("清理进行中...")
-            self.progress_panel.start()
-
-            threading.Thread(
-                target=self.cleanup_engine.run,
-                daemon=True
-            ).start()
+        # Write a preference change that is still waiting on its timer
+        if self._prefs_after_id is not None:
+            self.root.after_cancel(self._prefs_after_id)
+            self._flush_prefs()
+        self._io_pool.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
 
     def _on_operation_progress(self, stage, percent, message):
         """Called during operation progress (migration or cleanup)"""
+        # Runs on the engine thread - only overwrite the slot, _pump shows the
+        # latest value once per tick however fast the engine reports
+        with self._progress_lock:
+            self._progress_slot = (stage, percent, message)
+
+    def _apply_progress_slot(self):
+        """Show the latest engine progress, if any arrived since the last tick"""
+        with self._progress_lock:
+            slot, self._progress_slot = self._progress_slot, None
+        if slot is not None:
+            self._apply_progress(*slot)
+
+    def _discard_progress(self):
+        """Drop progress not yet shown so it can't overwrite the final state"""
+        with self._progress_lock:
+            self._progress_slot = None
+        self._idle_progress = None
+
+    def _apply_progress(self, stage, percent, message):
+        """Show operation progress (runs on the Tk thread)"""
         # Show stage and percent in progress panel (top)
-        self.root.after(0, self.progress_panel.update, stage, percent)
+        self._idle_progress = (stage, percent)
         # Show detailed message in status bar (bottom)
-        status_message = f"{stage} - {message}"
-        self.root.after(0, self._update_status, status_message)
+        self._update_status(f"{stage} - {message}")
 
     def _on_operation_complete(self):
         """Called when operation completes successfully (migration or cleanup)"""
-        def complete_ui():
-            self.progress_panel.complete()
-            self._set_ui_enabled(True)
-
-            if self.current_mode == "migration":
-                self._update_status("迁移成功完成！")
-                self.show_custom_info(
-                    "迁移完成",
-                    "✓ SD 卡迁移成功完成！\n\n"
-                    "您现在可以安全地移除两张 SD 卡。",
-                    width=500,
-                    height=220
-                )
-            else:  # cleanup mode
-                self._update_status("清理成功完成！")
-                self.show_custom_info(
-                    "清理完成",
-                    "✓ SD 卡清理成功完成！\n\n"
-                    "不需要的分区已被删除，FAT32 已扩展。\n\n"
-                    "您现在可以安全地移除 SD 卡。",
-                    width=550,
-                    height=300
-                )
-
-        self.root.after(0, complete_ui)
+        # Runs on the engine thread - the Tk side is handled by _apply_operation_result
+        self._ui_queue.put(('operation_result', None))
 
     def _on_operation_error(self, error_msg):
         """Called when operation fails (migration or cleanup)"""
-        def error_ui():
-            self.progress_panel.error()
-            self._set_ui_enabled(True)
+        self._ui_queue.put(('operation_result', error_msg))
 
-            if self.current_mode == "migration":
-                self._update_status(f"迁移失败：{error_msg}")
-                self.show_custom_info(
-                    "迁移失败",
-                    f"迁移失败，错误信息：\n\n{error_msg}\n\n"
-                    f"目标磁盘可能处于不一致状态。",
-                    width=550,
-                    height=280
-                )
-            else:  # cleanup mode
-                self._update_status(f"清理失败：{error_msg}")
-                self.show_custom_info(
-                    "清理失败",
-                    f"清理失败，错误信息：\n\n{error_msg}\n\n"
-                    f"SD 卡可能处于不一致状态。\n"
-                    f"如有需要，请从备份恢复。",
-                    width=550,
-                    height=300
-                )
+    def _apply_operation_result(self, error_msg):
+        """Show the final state of an operation (runs on the Tk thread)"""
+        strategy = self.strategy
+        self._operation_running = False
+        self._discard_progress()
+        self._set_ui_enabled(True)
 
-        self.root.after(0, error_ui)
+        if error_msg is None:
+            self.progress_panel.complete()
+            self._update_status(strategy.complete_status)
+            title, message = strategy.complete_title, strategy.complete_msg
+            width, height = strategy.complete_size
+        else:
+            self.progress_panel.error()
+            self._update_status(strategy.failed_status.format(error=error_msg))
+            title, message = strategy.failed_title, strategy.failed_msg.format(error=error_msg)
+            width, height = strategy.failed_size
+
+        # Open the modal once the new state is on screen, and without blocking _pump
+        self.root.after_idle(functools.partial(
+            self.show_custom_info, title, message, width=width, height=height, force_top=True
+        ))
 
     def _set_ui_enabled(self, enabled):
-        """Enable/disable UI during migration"""
+        """Enable/disable UI during migration
+
+        Disabling is applied at once so no further clicks get through; re-enabling
+        is applied in one batch when Tk is next idle, and the last request wins.
+        """
+        self._pending_ui_enabled = enabled
+        if not enabled:
+            self._apply_ui_enabled()
+        elif not self._ui_enabled_scheduled:
+            self._ui_enabled_scheduled = True
+            self.root.after_idle(self._apply_ui_enabled)
+
+    def _apply_ui_enabled(self):
+        """Apply the latest requested enabled state to all controls back-to-back"""
+        self._ui_enabled_scheduled = False
+        enabled = self._pending_ui_enabled
+        if enabled is None:
+            return
+        self._pending_ui_enabled = None
         state = NORMAL if enabled else DISABLED
 
         self.disk_selector.set_enabled(enabled)
@@ -878,8 +1047,25 @@ class MainWindow:
         self.migration_options_frame.set_enabled(enabled)
 
     def _update_status(self, message):
-        """Update status bar message"""
-        self.status_label.config(text=message)
+        """Update status bar message (applied once per idle cycle)"""
+        self._idle_status = message
+        self._schedule_idle_flush()
+
+    def _schedule_idle_flush(self):
+        """Apply buffered status/progress when Tk is next idle, unless already scheduled"""
+        if not self._idle_pending:
+            self._idle_pending = True
+            self.root.after_idle(self._flush_idle)
+
+    def _flush_idle(self):
+        """Apply the latest buffered status text and progress, once"""
+        self._idle_pending = False
+        if self._idle_progress is not None:
+            self._progress_update(*self._idle_progress)
+            self._idle_progress = None
+        if self._idle_status is not None:
+            self._tk_call(self._status_label_path, 'configure', '-text', self._idle_status)
+            self._idle_status = None
 
     def _toggle_log_panel(self):
         """Toggle log panel visibility"""
@@ -893,38 +1079,58 @@ class MainWindow:
             self.log_toggle_btn.config(text="显示日志")
             self._save_log_preference(False)
 
-    def center_window(self, window):
-        """Center a popup window on the main window"""
-        # This function is now a wrapper to call the actual centering logic
-        # after a small delay, preventing the "flicker" effect.
-        window.after(10, lambda: self._do_center(window))
-
-    def _do_center(self, window):
-        """Actually center the window"""
-        # Update both parent and child window to get accurate current positions
-        self.root.update_idletasks()
-        window.update_idletasks()
+    def _cache_geom(self, event):
+        """Remember the main window geometry when it moves or resizes"""
+        # <Configure> on the root also fires for every child widget
+        if event.widget is self.root:
+            self._parent_geom = (self.root.winfo_x(), self.root.winfo_y(), event.width, event.height)
+            # The window may have moved to another monitor
+            self._dialog_scale = _scale_for_screen(self.root.winfo_screenheight())
+
+    def _place_centered(self, window, width, height, parent_window=None):
+        """Size window to width x height, centered on parent_window (the main window by default)"""
+        if parent_window is None:
+            parent_window = self.root
+        if parent_window is self.root and self._parent_geom is not None:
+            parent_x, parent_y, parent_w, parent_h = self._parent_geom
+        else:
+            parent_x = parent_window.winfo_x()
+            parent_y = parent_window.winfo_y()
+            parent_w = parent_window.winfo_width()
+            parent_h = parent_window.winfo_height()
 
-        parent_x = self.root.winfo_x()
-        parent_y = self.root.winfo_y()
-        parent_w = self.root.winfo_width()
-        parent_h = self.root.winfo_height()
+        x = parent_x + (parent_w // 2) - (width // 2)
+        y = parent_y + (parent_h // 2) - (height // 2)
+        window.geometry(f"{width}x{height}+{x}+{y}")
 
-        window_w = window.winfo_width()
-        window_h = window.winfo_height()
+    def _raise_dialog(self, dialog, force_top=False):
+        """Bring a dialog to the front and focus it
 
-        x = parent_x + (parent_w // 2) - (window_w // 2)
-        y = parent_y + (parent_h // 2) - (window_h // 2)
+        force_top briefly makes it topmost, which is only needed when the popup is
+        raised by a background operation and the app may not be in the foreground.
+        """
+        dialog.lift()
+        if force_top:
+            dialog.attributes('-topmost', True)
+            # Drop topmost as soon as the dialog is actually on screen
+            dialog.bind('<Map>', self._drop_topmost, add='+')
+            dialog.focus_force()
+        else:
+            dialog.focus_set()
 
-        window.geometry(f"+{x}+{y}")
+    def _drop_topmost(self, event):
+        """<Map> handler: clear the temporary topmost flag set by _raise_dialog"""
+        # <Map> on a toplevel also fires for each child widget being mapped
+        dialog = event.widget
+        if dialog is dialog.winfo_toplevel():
+            dialog.attributes('-topmost', False)
+            dialog.unbind('<Map>')
 
-    def show_custom_info(self, title, message, parent=None, blocking=True, width=400, height=200):
+    def show_custom_info(self, title, message, parent=None, blocking=True, width=400, height=200, force_top=False):
         """Show a custom centered info dialog"""
         # Scale down for 1080p (cosmetic improvement)
-        screen_height = self.root.winfo_screenheight()
-        if screen_height < 1440:  # 1080p or lower
-            width = int(width * 0.75)
-            height = int(height * 0.75)
+        width = int(width * self._dialog_scale)
+        height = int(height * self._dialog_scale)
 
         parent_window = parent if parent else self.root
         dialog = ttk.Toplevel(parent_window)
@@ -939,45 +1145,30 @@ class MainWindow:
         info_frame = ttk.Frame(dialog, padding=20)
         info_frame.pack(fill=BOTH, expand=True)
 
-        ttk.Label(info_frame, text=message, wraplength=width-60, justify=CENTER).pack(pady=20)
-
-        ttk.Button(info_frame, text="OK", command=dialog.destroy, bootstyle="primary").pack()
-
-        # Update geometry and calculate centered position
-        dialog.update_idletasks()
-
-        # Get parent window position
-        parent_x = parent_window.winfo_x()
-        parent_y = parent_window.winfo_y()
-        parent_w = parent_window.winfo_width()
-        parent_h = parent_window.winfo_height()
+        ttk.Label(info_frame, text=message, wraplength=width-60, style='Dialog.TLabel').pack(pady=20)
 
-        # Calculate centered position
-        x = parent_x + (parent_w // 2) - (width // 2)
-        y = parent_y + (parent_h // 2) - (height // 2)
+        ttk.Button(info_frame, text="OK", command=dialog.destroy, style='primary.TButton').pack()
 
-        # Set geometry with position
-        dialog.geometry(f"{width}x{height}+{x}+{y}")
+        # Size is given, so the position can be computed without a layout pass
+        self._place_centered(dialog, width, height, parent_window)
 
         # Now show the window at the correct position
         dialog.deiconify()
 
-        # Force window to front and gain focus (essential for popups from background threads)
-        dialog.lift()
-        dialog.attributes('-topmost', True)
-        dialog.after(100, lambda: dialog.attributes('-topmost', False))
-        dialog.focus_force()
+        self._raise_dialog(dialog, force_top)
 
         if blocking:
             self.root.wait_window(dialog)
 
-    def show_custom_confirm(self, title, message, yes_text="是", no_text="否", style="primary", width=450, height=250):
-        """Show a custom centered confirmation dialog that returns True or False."""
+    def show_custom_confirm(self, title, message, yes_text="是", no_text="否", style="primary", width=450, height=250,
+                            checkbox_text=None, force_top=False):
+        """Show a custom centered confirmation dialog that returns True or False.
+
+        If checkbox_text is given, the yes button stays disabled until that box is checked.
+        """
         # Scale down for 1080p (cosmetic improvement)
-        screen_height = self.root.winfo_screenheight()
-        if screen_height < 1440:  # 1080p or lower
-            width = int(width * 0.75)
-            height = int(height * 0.75)
+        width = int(width * self._dialog_scale)
+        height = int(height * self._dialog_scale)
 
         dialog = ttk.Toplevel(self.root)
         dialog.title(title)
@@ -1000,37 +1191,33 @@ class MainWindow:
 
         info_frame = ttk.Frame(dialog, padding=20)
         info_frame.pack(fill=BOTH, expand=True)
-        ttk.Label(info_frame, text=message, wraplength=width-60, justify=CENTER).pack(pady=20)
+        ttk.Label(info_frame, text=message, wraplength=width-60, style='Dialog.TLabel').pack(pady=20)
 
         button_frame = ttk.Frame(info_frame)
-        button_frame.pack(pady=20)
-        ttk.Button(button_frame, text=yes_text, command=on_yes, bootstyle=style).pack(side=LEFT, padx=10)
-        ttk.Button(button_frame, text=no_text, command=on_no, bootstyle="secondary").pack(side=LEFT, padx=10)
-
-        # Update geometry and calculate centered position
-        dialog.update_idletasks()
-
-        # Get parent window position
-        parent_x = self.root.winfo_x()
-        parent_y = self.root.winfo_y()
-        parent_w = self.root.winfo_width()
-        parent_h = self.root.winfo_height()
+        yes_button = ttk.Button(button_frame, text=yes_text, command=on_yes, style=f"{style}.TButton")
+        yes_button.pack(side=LEFT, padx=10)
+        ttk.Button(button_frame, text=no_text, command=on_no, style='secondary.TButton').pack(side=LEFT, padx=10)
+
+        if checkbox_text:
+            confirmed = ttk.BooleanVar(dialog, value=False)
+            yes_button.config(state=DISABLED)
+            ttk.Checkbutton(
+                info_frame,
+                text=checkbox_text,
+                variable=confirmed,
+                command=lambda: yes_button.config(state=NORMAL if confirmed.get() else DISABLED),
+                style=f"{style}.TCheckbutton"
+            ).pack()
 
-        # Calculate centered position
-        x = parent_x + (parent_w // 2) - (width // 2)
-        y = parent_y + (parent_h // 2) - (height // 2)
+        button_frame.pack(pady=20)
 
-        # Set geometry with position
-        dialog.geometry(f"{width}x{height}+{x}+{y}")
+        # Size is given, so the position can be computed without a layout pass
+        self._place_centered(dialog, width, height)
 
         # Now show the window at the correct position
         dialog.deiconify()
 
-        # Force window to front and gain focus
-        dialog.lift()
-        dialog.attributes('-topmost', True)
-        dialog.after(100, lambda: dialog.attributes('-topmost', False))
-        dialog.focus_force()
+        self._raise_dialog(dialog, force_top)
 
         self.root.wait_window(dialog)
         return result[0]
@@ -1039,115 +1226,25 @@ class MainWindow:
 
     def _show_usage_guide(self):
         """Show usage guide dialog"""
-        usage_text = """使用指南
-
-步骤1: 选择磁盘
-• 插入源SD卡(较小)和目标SD卡(较大)
-• 点击"刷新磁盘"来检测SD卡
-• 选择您的源SD卡(原始卡)
-• 选择您的目标SD卡(目标卡)
-
-警告: 目标磁盘将被完全擦除!
-
-步骤2: 扫描源SD卡
-• 点击"模拟迁移"
-• 等待扫描完成
-• 查看检测到的分区布局
-
-工具会自动检测:
-• FAT32分区 (hos_data)
-• Linux分区 (L4T)
-• Android分区 (动态或传统)
-• emuMMC分区 (单个或双虚拟系统)
-
-步骤3: 配置迁移
-选择要迁移的内容:
-• FAT32分区 (默认迁移，自动扩展)
-• Linux分区 (可选)
-• Android分区 (可选)
-• emuMMC分区 (可选)
-
-步骤4: 查看布局
-• 查看新的分区布局
-• 检查显示大小变化的对比
-• 验证FAT32扩展和可用空间
-
-步骤5: 开始迁移
-• 点击"开始迁移"
-• 确认警告对话框
-• 等待迁移完成 (128GB需要30-60分钟)
-
-迁移过程中请勿移除SD卡或关机!
-
-步骤6: 验证
-• 安全移除两张SD卡
-• 将目标SD卡插入任天堂Switch
-• 正常启动 - 所有数据和分区都已保留
-"""
-
-        self._show_scrollable_dialog("使用指南", usage_text, width=700, height=650)
+        self._show_scrollable_dialog("使用指南", _USAGE_TEXT, width=700, height=650)
 
     def _show_troubleshooting(self):
         """Show troubleshooting dialog"""
-        troubleshooting_text = """故障排除
-
-"需要管理员权限"
-• 右键点击可执行文件并选择"以管理员身份运行"
-• 直接磁盘访问需要管理员权限
-
-"未找到SD卡"
-• 确保SD卡正确插入
-• 点击"刷新磁盘"重新扫描
-• 尝试不同的USB端口
-• 在设备管理器中检查SD卡读卡器
-• 确保SD卡未被其他程序挂载/使用
-
-"目标磁盘必须更大"
-• 确保目标SD卡实际上比源卡大
-• 某些SD卡报告的大小略有不同
-• 尝试容量更大的目标卡
-
-迁移失败
-• 检查SD卡连接
-• 尝试不同的SD卡读卡器
-• 验证目标SD卡未写保护
-• 检查目标SD卡是否有坏扇区
-• 关闭所有访问SD卡的程序
-• 在SD卡上运行磁盘检查 (chkdsk)
-
-迁移后emuMMC不工作
-• 工具会自动更新emuMMC扇区偏移
-• 如果问题持续，验证emuMMC/RAW1或emuMMC/RAW2
-  文件夹包含正确的偏移
-• 检查日志文件中的emuMMC更新错误
-• 确保已启用"迁移emuMMC"选项
-
-迁移速度慢
-• 使用高质量的SD卡读卡器 (USB 3.0+)
-• 避免USB集线器 - 直接连接到PC
-• 关闭后台程序以释放系统资源
-• 检查杀毒软件是否在扫描SD卡
-
-分区布局不正确
-• 验证源SD卡设置正确
-• 检查日志文件中的分区检测警告
-• 尝试重新扫描源磁盘
-• 确保最初使用了hekate分区管理器
-
-获取更多帮助:
-• 检查日志文件 (NXMigrator_YYYYMMDD_HHMMSS.log)
-• 在GitHub上报告问题并附上日志文件
-"""
-
-        self._show_scrollable_dialog("故障排除", troubleshooting_text, width=700, height=650)
+        self._show_scrollable_dialog("故障排除", _TROUBLESHOOTING_TEXT, width=700, height=650)
 
     def _open_logs(self):
         """Open the most recent log file"""
         try:
-            # Find the most recent log file
-            log_files = [f for f in os.listdir('.') if f.startswith('nx_migrator_pro_') and f.endswith('.log')]
+            # Find the most recent log file (reusing a recent lookup)
+            now = time.monotonic()
+            if self._last_log is not None and now - self._last_log[0] < _LOG_SCAN_TTL:
+                latest_log = self._last_log[1]
+            else:
+                latest_log = _find_latest_log()
+                # Only remember hits - a log file may be created at any moment
+                self._last_log = (now, latest_log) if latest_log is not None else None
 
-            if not log_files:
+            if latest_log is None:
                 self.show_custom_info(
                     "未找到日志",
                     "当前目录中未找到日志文件。",
@@ -1156,17 +1253,11 @@ class MainWindow:
                 )
                 return
 
-            # Sort by modification time and get the most recent
-            log_files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-            latest_log = log_files[0]
-
             # Open with default text editor
-            if sys.platform == 'win32':
-                os.startfile(latest_log)
-            elif sys.platform == 'darwin':
-                subprocess.run(['open', latest_log])
-            else:
-                subprocess.run(['xdg-open', latest_log])
+            self._open_in_background(
+                _open_file, latest_log,
+                "打开日志错误", "打开日志文件失败：\n\n{error}", 500, 220
+            )
 
         except Exception as e:
             self.show_custom_info(
@@ -1178,59 +1269,52 @@ class MainWindow:
 
     def _open_github_issues(self):
         """Open GitHub issues page"""
-        try:
-            # Update this URL to your actual GitHub repository
-            webbrowser.open('https://github.com/BadFish-HSrui/NX-Migrator-Pro-cn/issues')
-        except Exception as e:
-            self.show_custom_info(
-                "Error",
-                f"Failed to open browser:\n\n{str(e)}",
-                width=450,
-                height=250
-            )
-
-    def _show_about(self):
-        """Show about dialog"""
-        # Get version from main module
-        try:
-            import __main__
-            version = getattr(__main__, '__version__', '1.0.0')
-        except:
-            version = '1.0.0'
+        # Update this URL to your actual GitHub repository
+        self._open_in_background(
+            webbrowser.open, 'https://github.com/BadFish-HSrui/NX-Migrator-Pro-cn/issues',
+            "Error", "Failed to open browser:\n\n{error}", 450, 250
+        )
 
-        about_text = f"""NX MIGRATOR PRO
+    def _open_in_background(self, opener, target, error_title, error_msg, width, height):
+        """Run a slow OS open call off the Tk thread; failures are shown via the UI queue"""
+        def run():
+            try:
+                opener(target)
+            except Exception as e:
+                self._ui_queue.put(('open_failed', error_title, error_msg.format(error=e), width, height))
 
-版本: {version}
+        threading.Thread(target=run, daemon=True).start()
 
-任天堂Switch SD卡专业分区管理工具。
+    def _on_open_failed(self, title, message, width, height):
+        """Report a failed background open (runs on the Tk thread)"""
+        self.show_custom_info(title, message, width=width, height=height)
 
-功能特性:
-• 迁移模式 - 从小容量SD卡迁移分区到大容量SD卡
-• 清理模式 - 删除不需要的分区并扩展FAT32
+    def _show_about(self):
+        """Show about dialog"""
+        self._show_scrollable_dialog("关于 NX Migrator Pro", self._about_text, width=600, height=530)
 
-支持格式: FAT32, Linux (L4T), Android, emuMMC
+    def _show_scrollable_dialog(self, title, content, width=600, height=500, force_top=False):
+        """Show a scrollable text dialog"""
+        # Scale down for 1080p (cosmetic improvement)
+        width = int(width * self._dialog_scale)
+        height = int(height * self._dialog_scale)
 
-版权所有 (c) 2025 Sthetix
-许可证: GPL-2.0
+        # Help dialogs are built once, then hidden and shown again
+        dialog = self._dialogs.get(title)
+        if dialog is None or not dialog.winfo_exists():
+            dialog = self._dialogs[title] = self._build_scrollable_dialog(title, content)
 
-为任天堂Switch自制软件社区制作
+        # Size is given, so the position can be computed without a layout pass
+        self._place_centered(dialog, width, height)
 
----
-中文翻译 葡萄糖酸菜鱼;南宫镜
-此中文翻译版为非官方版本, 推荐使用官方英文版
-https://github.com/sthetix/NX-Migrator-Pro/releases
-"""
-
-        self._show_scrollable_dialog("关于 NX Migrator Pro", about_text, width=600, height=530)
+        # Now show the window at the correct position
+        dialog.deiconify()
+        dialog.grab_set()
 
-    def _show_scrollable_dialog(self, title, content, width=600, height=500):
-        """Show a scrollable text dialog"""
-        # Scale down for 1080p (cosmetic improvement)
-        screen_height = self.root.winfo_screenheight()
-        if screen_height < 1440:  # 1080p or lower
-            width = int(width * 0.75)
-            height = int(height * 0.75)
+        self._raise_dialog(dialog, force_top)
 
+    def _build_scrollable_dialog(self, title, content):
+        """Create a hidden scrollable text dialog; closing it hides it again"""
         dialog = ttk.Toplevel(self.root)
         dialog.title(title)
         dialog.transient(self.root)
@@ -1238,7 +1322,11 @@ https://github.com/sthetix/NX-Migrator-Pro/releases
         # Withdraw the window to prevent it from appearing at default position
         dialog.withdraw()
 
-        dialog.grab_set()
+        def hide():
+            dialog.grab_release()
+            dialog.withdraw()
+
+        dialog.protocol("WM_DELETE_WINDOW", hide)
 
         # Create frame for content
         content_frame = ttk.Frame(dialog, padding=10)
@@ -1251,62 +1339,56 @@ https://github.com/sthetix/NX-Migrator-Pro/releases
         scrollbar = ttk.Scrollbar(text_frame)
         scrollbar.pack(side=RIGHT, fill=Y)
 
+        if self._mono_font is None:
+            self._mono_font = tkfont.Font(root=self.root, family="Consolas", size=9)
+
         text_widget = ttk.Text(
             text_frame,
             wrap='word',
             yscrollcommand=scrollbar.set,
-            font=("Consolas", 9),
+            font=self._mono_font,
             padx=10,
             pady=10,
             height=15
         )
-        text_widget.pack(side=LEFT, fill=BOTH, expand=False)
         scrollbar.config(command=text_widget.yview)
 
-        # Insert content
+        # Insert content before packing so the text is wrapped and laid out once
         text_widget.insert('1.0', content)
         text_widget.config(state='disabled')
+        text_widget.pack(side=LEFT, fill=BOTH, expand=False)
 
         # Close button
         ttk.Button(
             content_frame,
             text="关闭",
-            command=dialog.destroy,
-            bootstyle="primary",
+            command=hide,
+            style='primary.TButton',
             width=15
         ).pack()
 
-        # Update geometry and calculate centered position
-        dialog.update_idletasks()
-
-        # Get parent window position
-        parent_x = self.root.winfo_x()
-        parent_y = self.root.winfo_y()
-        parent_w = self.root.winfo_width()
-        parent_h = self.root.winfo_height()
-
-        # Calculate centered position
-        x = parent_x + (parent_w // 2) - (width // 2)
-        y = parent_y + (parent_h // 2) - (height // 2)
-
-        # Set geometry with position
-        dialog.geometry(f"{width}x{height}+{x}+{y}")
-
-        # Now show the window at the correct position
-        dialog.deiconify()
-
-        # Force window to front
-        dialog.lift()
-        dialog.attributes('-topmost', True)
-        dialog.after(100, lambda: dialog.attributes('-topmost', False))
-        dialog.focus_force()
+        return dialog
 
     def _save_log_preference(self, visible):
-        """Save log panel visibility preference"""
+        """Save log panel visibility preference (deferred, only the latest value is written)"""
+        self._pending_log_pref = visible
+        if self._prefs_after_id is not None:
+            self.root.after_cancel(self._prefs_after_id)
+        self._prefs_after_id = self.root.after(_PREFS_SAVE_DELAY_MS, self._flush_prefs)
+
+    def _flush_prefs(self):
+        """Write the pending preference, if it differs from what is on disk"""
+        self._prefs_after_id = None
+        visible = self._pending_log_pref
+        if visible is None or visible == self._saved_log_pref:
+            return
         try:
-            prefs = {'log_panel_visible': visible}
-            with open('.nx_migrator_prefs.json', 'w') as f:
-                json.dump(prefs, f)
+            # Write a temp file and swap it in, so the file is never half-written
+            tmp_path = _PREFS_FILE + '.tmp'
+            with open(tmp_path, 'w') as f:
+                f.write(f"show_log={int(visible)}\n")
+            os.replace(tmp_path, _PREFS_FILE)
+            self._saved_log_pref = visible
         except Exception:
             # Silently ignore errors saving preferences
             pass
@@ -1314,12 +1396,11 @@ https://github.com/sthetix/NX-Migrator-Pro/releases
     def _load_log_preference(self):
         """Load and apply log panel visibility preference"""
         try:
-            if os.path.exists('.nx_migrator_prefs.json'):
-                with open('.nx_migrator_prefs.json', 'r') as f:
-                    prefs = json.load(f)
-                    if prefs.get('log_panel_visible', False):
-                        self.log_panel.show()
-                        self.log_toggle_btn.config(text="隐藏日志")
+            self._saved_log_pref = _read_log_preference()
+            # The user may have toggled the panel before this ran; that choice wins
+            if self._saved_log_pref and self._pending_log_pref is None:
+                self.log_panel.show()
+                self.log_toggle_btn.config(text="隐藏日志")
         except Exception:
             # Silently ignore errors loading preferences
             pass
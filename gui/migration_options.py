@@ -2,9 +2,44 @@
 Migration Options Widget - Select what to migrate
 """
 
+from dataclasses import dataclass
+from functools import cached_property
+
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 
+
+@dataclass(frozen=True)
+class Options:
+    """Immutable snapshot of the option toggles"""
+    migrate_fat32: bool = True
+    migrate_linux: bool = True
+    migrate_android: bool = True
+    migrate_emummc: bool = True
+    expand_fat32: bool = True
+
+    @cached_property
+    def as_migration_dict(self):
+        """Options dict as used by the migration engine"""
+        return {
+            'migrate_fat32': self.migrate_fat32,
+            'migrate_linux': self.migrate_linux,
+            'migrate_android': self.migrate_android,
+            'migrate_emummc': self.migrate_emummc,
+            'expand_fat32': self.expand_fat32
+        }
+
+    @cached_property
+    def as_cleanup_dict(self):
+        """Options dict as used by the cleanup engine (in cleanup mode, checked = remove)"""
+        return {
+            'remove_linux': self.migrate_linux,
+            'remove_android': self.migrate_android,
+            'remove_emummc': self.migrate_emummc,
+            'expand_fat32': self.expand_fat32
+        }
+
+
 class MigrationOptionsFrame(ttk.Frame):
     """Widget for selecting migration options"""
 
@@ -15,13 +50,7 @@ class MigrationOptionsFrame(ttk.Frame):
         self.current_mode = "migration"  # "migration" or "cleanup"
 
         # Options state
-        self.options = {
-            'migrate_fat32': True,
-            'migrate_linux': True,
-            'migrate_android': True,
-            'migrate_emummc': True,
-            'expand_fat32': True
-        }
+        self.options = Options()
 
         self._create_widgets()
         self._layout_widgets()
@@ -145,17 +174,21 @@ class MigrationOptionsFrame(ttk.Frame):
 
     def _on_option_changed(self):
         """Called when any option changes"""
-        self.options = {
-            'migrate_fat32': self.fat32_var.get(),
-            'migrate_linux': self.linux_var.get(),
-            'migrate_android': self.android_var.get(),
-            'migrate_emummc': self.emummc_var.get(),
-            'expand_fat32': self.expand_var.get()
-        }
+        self.options = self._read_options()
 
         if self.on_options_changed:
             self.on_options_changed(self.options)
 
+    def _read_options(self):
+        """Snapshot the current toggle states"""
+        return Options(
+            migrate_fat32=self.fat32_var.get(),
+            migrate_linux=self.linux_var.get(),
+            migrate_android=self.android_var.get(),
+            migrate_emummc=self.emummc_var.get(),
+            expand_fat32=self.expand_var.get()
+        )
+
     def _select_all(self):
         """Select all options"""
         self.linux_var.set(True)
@@ -240,10 +273,4 @@ class MigrationOptionsFrame(ttk.Frame):
 
         # Update internal options state but DON'T trigger callback
         # This prevents double calculation when scanning
-        self.options = {
-            'migrate_fat32': self.fat32_var.get(),
-            'migrate_linux': self.linux_var.get(),
-            'migrate_android': self.android_var.get(),
-            'migrate_emummc': self.emummc_var.get(),
-            'expand_fat32': self.expand_var.get()
-        }
+        self.options = self._read_options()
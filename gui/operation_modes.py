@@ -0,0 +1,366 @@
+"""
+Operation Modes - Per-mode behaviour of the main window (migration / cleanup)
+"""
+
+from abc import ABC, abstractmethod
+
+from ttkbootstrap.constants import *
+
+
+class OperationStrategy(ABC):
+    """Base class for the parts of the workflow that differ between modes"""
+
+    mode = None  # Key in MainWindow._strategies, read back as MainWindow.current_mode
+    needs_target = False  # Whether a separate target disk must be selected
+
+    # Widget options applied by MainWindow._switch_mode, one configure() per widget
+    widget_state = {}
+
+    source_title = ""
+    target_title = ""
+    ready_status = ""
+    scan_status = ""
+    scan_busy_text = ""
+    scan_idle_text = ""
+    scan_done_status = ""  # {summary}
+    calc_done_status = ""
+    running_status = ""
+    log_name = ""
+
+    complete_status = ""
+    complete_title = ""
+    complete_msg = ""
+    complete_size = (500, 220)
+    failed_status = ""  # {error}
+    failed_title = ""
+    failed_msg = ""  # {error}
+    failed_size = (550, 280)
+
+    def __init__(self, window):
+        self.window = window
+
+    @property
+    @abstractmethod
+    def options(self):
+        """The long-lived options dict for this mode"""
+
+    @abstractmethod
+    def sync_options(self, options):
+        """Copy an Options snapshot into this mode's options dict"""
+
+    @abstractmethod
+    def layout_disk(self):
+        """The disk the target layout is calculated for"""
+
+    def calculate(self):
+        """Calculate the target layout from the window's current state"""
+        window = self.window
+        return window.scanner.calculate_target_layout(
+            window.source_layout,
+            self.layout_disk()['size_bytes'],
+            self._calc_options()
+        )
+
+    def _calc_options(self):
+        """Options in the form PartitionScanner.calculate_target_layout expects"""
+        return self.options
+
+    @abstractmethod
+    def format_comparison(self):
+        """Return (title, message, height) comparing source and target layouts"""
+
+    @abstractmethod
+    def confirm(self):
+        """Ask the user to confirm the operation; True to go ahead"""
+
+    @abstractmethod
+    def create_engine(self):
+        """Create the engine that performs the operation"""
+
+
+class MigrationStrategy(OperationStrategy):
+    """Copy partitions from the source SD card to a larger target"""
+
+    mode = "migration"
+    needs_target = True
+
+    widget_state = {
+        'migration_mode_btn': {'bootstyle': "primary"},
+        'cleanup_mode_btn': {'bootstyle': "secondary-outline"},
+        'left_panel': {'text': "步骤1: 选择源和目标磁盘"},
+        'middle_panel': {'text': "步骤2: 查看分区"},
+        'right_panel': {'text': "步骤3: 迁移选项"},
+        'scan_button': {'text': "🔍 模拟迁移"},
+        'migrate_button': {'text': "🚀 开始迁移", 'state': DISABLED},
+        'summary_button': {'state': DISABLED},
+    }
+
+    source_title = "📀 源SD卡"
+    target_title = "💾 目标SD卡 (迁移后)"
+    ready_status = "迁移模式: 选择源和目标SD卡，然后点击'模拟迁移'。"
+    scan_status = "正在扫描源磁盘并模拟迁移..."
+    scan_busy_text = "⏳ 模拟中..."
+    scan_idle_text = "🔍 模拟迁移"
+    scan_done_status = "扫描完成: {summary}。正在计算目标布局..."
+    calc_done_status = "布局计算完成。准备开始迁移。"
+    running_status = "迁移进行中..."
+    log_name = "Migration"
+
+    complete_status = "迁移成功完成！"
+    complete_title = "迁移完成"
+    complete_msg = "✓ SD 卡迁移成功完成！\n\n您现在可以安全地移除两张 SD 卡。"
+    complete_size = (500, 220)
+    failed_status = "迁移失败：{error}"
+    failed_title = "迁移失败"
+    failed_msg = "迁移失败，错误信息：\n\n{error}\n\n目标磁盘可能处于不一致状态。"
+    failed_size = (550, 280)
+
+    _CONFIRM_MSG = (
+        "⚠️ 警告 ⚠️\n\n"
+        "这将会清除目标磁盘上的所有数据：\n"
+        "{target[letter]} - {target[name]} ({target[size_gb]:.1f} GB)\n\n"
+        "源磁盘 ({source[letter]}) 不会被修改。\n\n"
+        "此操作无法撤销！"
+    )
+    _ACK_MSG = "我了解 {target[letter]} ({target[name]}) 上的所有数据将被永久清除"
+
+    @property
+    def options(self):
+        return self.window.migration_options
+
+    def sync_options(self, options):
+        self.window.migration_options.update(options.as_migration_dict)
+
+    def layout_disk(self):
+        return self.window.target_disk
+
+    def format_comparison(self):
+        window = self.window
+        options = window.migration_options
+        source_layout = window.source_layout
+        msg = "迁移摘要：\n\n"
+
+        # FAT32
+        if options['migrate_fat32']:
+            src_fat = source_layout.get_fat32_size_mb()
+            dst_fat = window.target_layout.get_fat32_size_mb()
+            fat32_gain = dst_fat - src_fat
+            if options['expand_fat32']:
+                msg += f"✓ FAT32: {src_fat:,} MB → {dst_fat:,} MB (+{fat32_gain:,} MB 扩展)\n"
+            else:
+                msg += f"✓ FAT32: {src_fat:,} MB → {dst_fat:,} MB (无扩展)\n"
+
+        # Linux
+        if source_layout.has_linux and options['migrate_linux']:
+            linux_size = source_layout.get_linux_size_mb()
+            msg += f"✓ Linux: {linux_size:,} MB (preserved)\n"
+
+        # Android
+        if source_layout.has_android and options['migrate_android']:
+            android_size = source_layout.get_android_size_mb()
+            android_type = "动态" if source_layout.android_dynamic else "传统"
+            msg += f"✓ Android ({android_type}): {android_size:,} MB (保持)\n"
+
+        # emuMMC
+        if source_layout.has_emummc and options['migrate_emummc']:
+            emummc_size = source_layout.get_emummc_size_mb()
+            emummc_type = "双虚拟系统" if source_layout.emummc_double else "单虚拟系统"
+            msg += f"✓ emuMMC ({emummc_type}): {emummc_size:,} MB (保持)\n"
+
+        msg += f"\n源磁盘：{window.source_disk['size_gb']:.1f} GB\n"
+        msg += f"目标磁盘：{window.target_disk['size_gb']:.1f} GB"
+
+        return ("布局对比", msg, 400)
+
+    def confirm(self):
+        window = self.window
+        disks = {'source': window.source_disk, 'target': window.target_disk}
+        return window.show_custom_confirm(
+            "确认迁移",
+            self._CONFIRM_MSG.format_map(disks),
+            yes_text="是的，清除并迁移",
+            no_text="取消",
+            style="danger",
+            width=550,
+            height=440,
+            checkbox_text=self._ACK_MSG.format_map(disks)
+        )
+
+    def create_engine(self):
+        # Imported here to keep the engine off the startup path
+        from core.migration_engine import MigrationEngine
+        window = self.window
+        return MigrationEngine(
+            window.source_disk,
+            window.target_disk,
+            window.source_layout,
+            window.target_layout,
+            # A copy, so later UI changes don't reach the running engine
+            dict(window.migration_options)
+        )
+
+
+class CleanupStrategy(OperationStrategy):
+    """Remove unwanted partitions from one SD card and expand FAT32"""
+
+    mode = "cleanup"
+    needs_target = False
+
+    widget_state = {
+        'migration_mode_btn': {'bootstyle': "secondary-outline"},
+        'cleanup_mode_btn': {'bootstyle': "success"},
+        'left_panel': {'text': "步骤1: 选择SD卡"},
+        'middle_panel': {'text': "步骤2: 查看当前分区"},
+        'right_panel': {'text': "步骤3: 清理选项"},
+        'scan_button': {'text': "🔍 扫描SD卡"},
+        'migrate_button': {'text': "🧹 开始清理", 'state': DISABLED},
+        'summary_button': {'state': DISABLED},
+    }
+
+    source_title = "📀 当前SD卡布局"
+    target_title = "✨ 清理后 (预览)"
+    ready_status = "清理模式: 选择要清理不需要分区的SD卡。"
+    scan_status = "正在扫描SD卡并模拟清理..."
+    scan_busy_text = "⏳ 扫描中..."
+    scan_idle_text = "🔍 扫描SD卡"
+    scan_done_status = "扫描完成: {summary}。选择清理选项并计算预览..."
+    calc_done_status = "清理预览准备完成。准备开始清理。"
+    running_status = "清理进行中..."
+    log_name = "Cleanup"
+
+    complete_status = "清理成功完成！"
+    complete_title = "清理完成"
+    complete_msg = (
+        "✓ SD 卡清理成功完成！\n\n"
+        "不需要的分区已被删除，FAT32 已扩展。\n\n"
+        "您现在可以安全地移除 SD 卡。"
+    )
+    complete_size = (550, 300)
+    failed_status = "清理失败：{error}"
+    failed_title = "清理失败"
+    failed_msg = (
+        "清理失败，错误信息：\n\n{error}\n\n"
+        "SD 卡可能处于不一致状态。\n"
+        "如有需要，请从备份恢复。"
+    )
+    failed_size = (550, 300)
+
+    _CONFIRM_MSG = (
+        "⚠️ WARNING ⚠️\n\n"
+        "This will MODIFY the disk:\n"
+        "{source[letter]} - {source[name]} ({source[size_gb]:.1f} GB)\n\n"
+        "Partitions to remove:\n{parts}\n\n"
+        "FAT32 data will be backed up temporarily, then restored.\n\n"
+        "⚠️ IMPORTANT: Make sure you have a backup of your SD card!\n\n"
+        "此操作无法撤销！"
+    )
+    _ACK_MSG = "我已备份，并了解删除的分区将被永久删除"
+
+    @property
+    def options(self):
+        return self.window.cleanup_options
+
+    def sync_options(self, options):
+        # In cleanup mode, checked = remove
+        self.window.cleanup_options.update(options.as_cleanup_dict)
+
+    def layout_disk(self):
+        # Same disk, with partitions removed
+        return self.window.source_disk
+
+    def _calc_options(self):
+        # Use cleanup options to determine what to remove
+        options = self.window.cleanup_options
+        return {
+            'migrate_fat32': True,  # Always keep FAT32
+            'migrate_linux': not options['remove_linux'],
+            'migrate_android': not options['remove_android'],
+            'migrate_emummc': not options['remove_emummc'],
+            'expand_fat32': options['expand_fat32']
+        }
+
+    def format_comparison(self):
+        window = self.window
+        options = window.cleanup_options
+        source_layout = window.source_layout
+        msg = "Cleanup Summary:\n\n"
+
+        # FAT32
+        src_fat = source_layout.get_fat32_size_mb()
+        dst_fat = window.target_layout.get_fat32_size_mb()
+        fat32_gain = dst_fat - src_fat
+        if options['expand_fat32']:
+            msg += f"✓ FAT32: {src_fat:,} MB → {dst_fat:,} MB (+{fat32_gain:,} MB 回收)\n"
+        else:
+            msg += f"✓ FAT32: {src_fat:,} MB (无扩展)\n"
+
+        # Linux
+        if source_layout.has_linux:
+            linux_size = source_layout.get_linux_size_mb()
+            if options['remove_linux']:
+                msg += f"✗ Linux: {linux_size:,} MB (will be REMOVED)\n"
+            else:
+                msg += f"✓ Linux: {linux_size:,} MB (preserved)\n"
+
+        # Android
+        if source_layout.has_android:
+            android_size = source_layout.get_android_size_mb()
+            android_type = "动态" if source_layout.android_dynamic else "传统"
+            if options['remove_android']:
+                msg += f"✗ Android ({android_type}): {android_size:,} MB (将被删除)\n"
+            else:
+                msg += f"✓ Android ({android_type}): {android_size:,} MB (保持)\n"
+
+        # emuMMC
+        if source_layout.has_emummc:
+            emummc_size = source_layout.get_emummc_size_mb()
+            emummc_type = "双虚拟系统" if source_layout.emummc_double else "单虚拟系统"
+            if options['remove_emummc']:
+                msg += f"✗ emuMMC ({emummc_type}): {emummc_size:,} MB (将被删除)\n"
+            else:
+                msg += f"✓ emuMMC ({emummc_type}): {emummc_size:,} MB (保持)\n"
+
+        msg += f"\nSD 卡：{window.source_disk['size_gb']:.1f} GB"
+
+        return ("清理摘要", msg, 380)
+
+    def confirm(self):
+        window = self.window
+        options = window.cleanup_options
+        source_layout = window.source_layout
+
+        removed_parts = []
+        if options['remove_linux'] and source_layout.has_linux:
+            removed_parts.append("Linux partition")
+        if options['remove_android'] and source_layout.has_android:
+            removed_parts.append("Android partitions")
+        if options['remove_emummc'] and source_layout.has_emummc:
+            removed_parts.append("emuMMC partition(s)")
+
+        if removed_parts:
+            parts_str = ", ".join(removed_parts)
+        else:
+            parts_str = "No partitions will be removed (only FAT32 expansion)"
+
+        return window.show_custom_confirm(
+            "Confirm Cleanup",
+            self._CONFIRM_MSG.format_map({'source': window.source_disk, 'parts': parts_str}),
+            yes_text="是的，我已备份 - 继续",
+            no_text="取消",
+            style="danger",
+            width=600,
+            height=540,
+            checkbox_text=self._ACK_MSG
+        )
+
+    def create_engine(self):
+        # Imported here to keep the engine off the startup path
+        from core.cleanup_engine import CleanupEngine
+        window = self.window
+        return CleanupEngine(
+            window.source_disk,
+            window.source_layout,
+            window.target_layout,
+            # A copy, so later UI changes don't reach the running engine
+            dict(window.cleanup_options)
+        )
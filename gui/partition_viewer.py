@@ -17,6 +17,8 @@ class PartitionViewerFrame(ttk.Frame):
         self.layout = None
         self.disk_info = None
         self._redraw_attempts = 0  # Track redraw attempts
+        self._rendered = ()  # Row values currently shown in the partition list
+        self._row_items = []  # Treeview item ids, one per rendered row
 
         self._create_widgets()
         self._layout_widgets()
@@ -130,18 +132,12 @@ class PartitionViewerFrame(ttk.Frame):
         # Update disk label
         self.disk_label.config(text=f"{disk_info['name']} - {disk_info['size_gb']:.2f} GB")
 
-        # Clear previous data
-        for item in self.partition_list.get_children():
-            self.partition_list.delete(item)
-
-        # Add partitions to tree
-        for partition in layout.partitions:
-            self.partition_list.insert('', END, values=(
-                partition.name,
-                partition.type_name,
-                f"{partition.start_sector * 512 // (1024 * 1024):,}",
-                f"{partition.size_mb:,}"
-            ))
+        # Update partition list, touching only rows that changed
+        rows = tuple(
+            (name, type_name, f"{start_mb:,}", f"{size_mb:,}")
+            for name, type_name, start_mb, size_mb in layout.rows()
+        )
+        self._render_rows(rows)
 
         # Draw visual partition bar
         self._draw_partition_bar()
@@ -151,6 +147,23 @@ class PartitionViewerFrame(ttk.Frame):
         self.summary_label.config(text=summary)
         logger.info(f"Summary: {summary}")
 
+    def _render_rows(self, rows):
+        """Diff rows against the rendered ones and update the tree in place"""
+        items = self._row_items
+
+        for i, (old_row, new_row) in enumerate(zip(self._rendered, rows)):
+            if old_row != new_row:
+                self.partition_list.item(items[i], values=new_row)
+
+        # Add new rows / remove rows that are gone
+        for row in rows[len(items):]:
+            items.append(self.partition_list.insert('', END, values=row))
+        if len(items) > len(rows):
+            self.partition_list.delete(*items[len(rows):])
+            del items[len(rows):]
+
+        self._rendered = rows
+
     def _draw_partition_bar(self):
         """Draw visual partition bar"""
         import logging
@@ -309,7 +322,9 @@ class PartitionViewerFrame(ttk.Frame):
         for widget in self.legend_frame.winfo_children():
             widget.destroy()
 
-        for item in self.partition_list.get_children():
-            self.partition_list.delete(item)
+        if self._row_items:
+            self.partition_list.delete(*self._row_items)
+        self._row_items = []
+        self._rendered = ()
 
         self.summary_label.config(text="")
@@ -0,0 +1,22 @@
+"""
+Styles - Named ttk styles shared by the GUI widgets
+"""
+
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+
+_registered = False
+
+
+def register_styles():
+    """Register the shared named styles once (needs an existing Tk root)"""
+    global _registered
+    if _registered:
+        return
+    style = ttk.Style()
+    # Disk info and warning labels in DiskSelectorFrame
+    style.configure('Info.TLabel', foreground=style.colors.info)
+    style.configure('Danger.TLabel', foreground=style.colors.danger)
+    # Message text in MainWindow's custom dialogs
+    style.configure('Dialog.TLabel', justify=CENTER)
+    _registered = True
@@ -22,9 +22,6 @@ from datetime import datetime
 # Add project root to path
 sys.path.insert(0, os.path.dirname(__file__))
 
-from core.disk_manager import DiskManager
-from core.partition_scanner import PartitionScanner
-from core.migration_engine import MigrationEngine
 from gui.main_window import MainWindow
 from gui.log_panel import GUILogHandler
 